@@ -0,0 +1,25 @@
+# ~/work/xyllidium/core/readiness.py
+"""
+Readiness signalling for supervised services.
+
+The supervisor exports XYLL_READY_ADDR=host:port; a service calls
+notify_ready() once its sockets are bound. Outside the supervisor the
+variable is unset and this is a no-op.
+"""
+import os, json, socket, time
+
+READY_ENV = "XYLL_READY_ADDR"
+
+
+def notify_ready(service: str, **info) -> bool:
+    addr = os.environ.get(READY_ENV)
+    if not addr:
+        return False
+    host, port = addr.rsplit(":", 1)
+    msg = {"service": service, "pid": os.getpid(), "ready_at": time.time(), **info}
+    try:
+        with socket.create_connection((host, int(port)), timeout=2) as s:
+            s.sendall((json.dumps(msg) + "\n").encode())
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,39 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.xyllenor.ledger import StripedLedger, apply_parallel, _stress
+
+
+def test_stress_matches_sequential_replay():
+    # few stripes and accounts: most transfers contend for the same locks
+    assert _stress(threads=8, n=40_000, accounts=50, stripes=4, seed=7)
+
+
+def test_transfers_within_one_stripe():
+    ledger = StripedLedger({"a": 10.0}, stripes=1)
+    ledger.transfer("a", "b", 4)
+    ledger.transfer("b", "b", 1)
+    assert ledger.balance("a") == 6.0
+    assert ledger.balance("b") == 4.0
+    assert ledger.balance("missing") == 0.0
+
+
+def test_snapshot_is_consistent_under_load():
+    names = [f"acct-{i}" for i in range(20)]
+    ledger = StripedLedger({a: 100.0 for a in names}, stripes=8)
+    rng = random.Random(1)
+    transfers = [(*rng.sample(names, 2), float(rng.randint(1, 9))) for _ in range(20_000)]
+    totals, done = [], threading.Event()
+
+    def watch():
+        while not done.is_set():
+            totals.append(ledger.total())
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        apply_parallel(ledger, transfers, pool, chunk=256)
+    done.set()
+    watcher.join()
+    assert totals and all(t == 2000.0 for t in totals)
@@ -0,0 +1,227 @@
+# ~/work/xyllidium/core/tracing.py
+"""
+Lightweight cross-process tracing for intents.
+
+- A trace starts where an intent is built (executor) or, for untraced
+  intents, where it enters the engine. The sampling decision is made once
+  at the root (XYLL_TRACE_SAMPLE, 0..1, default 0 = off) and travels with
+  the trace; unsampled spans cost one contextvar lookup
+- Context crosses process boundaries in the intent envelope under
+  TRACE_KEY. inject() returns a copy for the wire and extract() pops it
+  again, so the hashed and signed intent never contains it
+- Finished spans are appended as JSON lines to XYLL_TRACE_FILE
+  (default logs/traces.jsonl); each line is one O_APPEND write, so every
+  process can share the sink
+
+  python -m core.tracing                 # slowest recent traces
+  python -m core.tracing <trace_id>      # waterfall for one intent
+"""
+import os, sys, json, time, random, functools, contextlib, threading
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_KEY = "_trace"
+TRACE_FILE = os.environ.get("XYLL_TRACE_FILE", os.path.join(REPO_ROOT, "logs", "traces.jsonl"))
+SAMPLE_RATE = float(os.environ.get("XYLL_TRACE_SAMPLE", "0"))
+SERVICE = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+
+# (trace_id, span_id, sampled) of the innermost open span
+_current: ContextVar[Optional[tuple]] = ContextVar("xyll_trace", default=None)
+_sink_fd: Optional[int] = None
+_sink_lock = threading.Lock()
+
+
+def _new_id(bits: int = 64) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def set_service(name: str):
+    """Label spans from this process (defaults to the script name)."""
+    global SERVICE
+    SERVICE = name
+
+
+def _emit(rec: Dict[str, Any]):
+    global _sink_fd
+    line = (json.dumps(rec, default=str) + "\n").encode()
+    with _sink_lock:
+        if _sink_fd is None:
+            os.makedirs(os.path.dirname(TRACE_FILE), exist_ok=True)
+            _sink_fd = os.open(TRACE_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(_sink_fd, line)
+
+
+@contextlib.contextmanager
+def span(name: str, parent: Optional[tuple] = None, root: bool = False, **attrs):
+    """
+    Time a stage. Nests under the current span, or under `parent` (from
+    extract()). With no trace active, `root=True` starts one subject to
+    sampling; otherwise the block runs untraced.
+    """
+    ctx = parent or _current.get()
+    if ctx is None:
+        if not root:
+            yield None
+            return
+        ctx = (_new_id(128), None, random.random() < SAMPLE_RATE)
+    trace_id, parent_id, sampled = ctx
+    if not sampled:
+        token = _current.set(ctx)
+        try:
+            yield None
+        finally:
+            _current.reset(token)
+        return
+
+    span_id = _new_id()
+    token = _current.set((trace_id, span_id, True))
+    rec = {"trace_id": trace_id, "span_id": span_id, "parent_id": parent_id, "name": name,
+           "service": SERVICE, "pid": os.getpid(), "start": time.time()}
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    except BaseException as e:
+        rec["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        rec["dur_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        if attrs:
+            rec["attrs"] = attrs
+        _current.reset(token)
+        _emit(rec)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span() for plain functions; no-op outside a trace."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*a, **k):
+            if _current.get() is None:
+                return fn(*a, **k)
+            with span(label):
+                return fn(*a, **k)
+        return wrapper
+    return deco
+
+
+def inject(intent: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of `intent` carrying the current trace context (unchanged if none)."""
+    ctx = _current.get()
+    if ctx is None:
+        return intent
+    trace_id, span_id, sampled = ctx
+    return {**intent, TRACE_KEY: {"trace_id": trace_id, "parent_id": span_id, "sampled": sampled}}
+
+
+def extract(intent: Dict[str, Any]) -> Optional[tuple]:
+    """Pop the trace context off a received intent; pass the result to span(parent=...)."""
+    env = intent.pop(TRACE_KEY, None)
+    if not isinstance(env, dict) or "trace_id" not in env:
+        return None
+    return (env["trace_id"], env.get("parent_id"), bool(env.get("sampled")))
+
+
+def current_trace_id() -> Optional[str]:
+    ctx = _current.get()
+    return ctx[0] if ctx else None
+
+
+# ---- reconstruction ----
+
+def load_spans(path: str = TRACE_FILE, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    out = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a killed process
+                if trace_id is None or rec.get("trace_id", "").startswith(trace_id):
+                    out.append(rec)
+    except FileNotFoundError:
+        pass
+    return out
+
+
+def summarize(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One row per trace: wall-clock extent across all processes."""
+    by_trace: Dict[str, List[Dict[str, Any]]] = {}
+    for s in spans:
+        by_trace.setdefault(s["trace_id"], []).append(s)
+    rows = []
+    for tid, ss in by_trace.items():
+        start = min(s["start"] for s in ss)
+        end = max(s["start"] + s["dur_ms"] / 1000 for s in ss)
+        roots = [s for s in ss if not s.get("parent_id")] or ss
+        rows.append({"trace_id": tid, "start": start, "total_ms": round((end - start) * 1000, 3),
+                     "spans": len(ss), "root": roots[0]["name"],
+                     "services": sorted({s["service"] for s in ss})})
+    return rows
+
+
+def waterfall(spans: List[Dict[str, Any]], width: int = 48) -> str:
+    """Render one trace as an indented span tree with offsets and bars."""
+    if not spans:
+        return "(no spans)"
+    ids = {s["span_id"] for s in spans}
+    children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        # parents recorded by an unsampled or lost process attach at the top
+        children.setdefault(s["parent_id"] if s["parent_id"] in ids else None, []).append(s)
+    for v in children.values():
+        v.sort(key=lambda s: s["start"])
+
+    t0 = min(s["start"] for s in spans)
+    total = max(s["start"] + s["dur_ms"] / 1000 for s in spans) - t0 or 1e-9
+    lines = [f"trace {spans[0]['trace_id']}  total {total * 1000:.2f} ms"]
+
+    def walk(parent, depth):
+        for s in children.get(parent, []):
+            off = s["start"] - t0
+            a = min(int(off / total * width), width - 1)
+            b = min(width, max(a + 1, int((off + s["dur_ms"] / 1000) / total * width)))
+            bar = " " * a + "█" * (b - a) + " " * (width - b)
+            label = ("  " * depth + s["name"])[:32]
+            err = "  ✗ " + s["error"] if s.get("error") else ""
+            lines.append(f"{off * 1000:9.2f} ms {s['dur_ms']:9.2f} ms  {label:<32} "
+                         f"{s['service']}[{s['pid']}]  |{bar}|{err}")
+            walk(s["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Reconstruct intent traces from the span sink.")
+    ap.add_argument("trace_id", nargs="?", help="trace id (or prefix) to render as a waterfall")
+    ap.add_argument("--file", default=TRACE_FILE)
+    ap.add_argument("--slowest", type=int, default=10, help="list the N slowest traces")
+    ap.add_argument("--width", type=int, default=48)
+    args = ap.parse_args()
+
+    spans = load_spans(args.file, args.trace_id)
+    if args.trace_id:
+        for tid in sorted({s["trace_id"] for s in spans}):
+            print(waterfall([s for s in spans if s["trace_id"] == tid], args.width))
+            print()
+        if not spans:
+            print(f"no spans for {args.trace_id} in {args.file}")
+            sys.exit(1)
+        return
+
+    rows = sorted(summarize(spans), key=lambda r: r["total_ms"], reverse=True)[:args.slowest]
+    if not rows:
+        print(f"no traces in {args.file} (is XYLL_TRACE_SAMPLE > 0?)")
+        return
+    print(f"{'trace':<34} {'total':>10}  spans  root / services")
+    for r in rows:
+        print(f"{r['trace_id']:<34} {r['total_ms']:8.2f}ms  {r['spans']:>5}  {r['root']} / {', '.join(r['services'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,300 @@
+use numpy::{PyReadonlyArrayDyn, PyReadwriteArrayDyn};
+use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
 use rand::Rng;
+use rayon::prelude::*;
+use std::collections::HashMap;
+use std::sync::{Arc, Mutex, OnceLock};
+
+/// Single-pass mean / population variance (Welford).
+fn mean_variance<'a, I: IntoIterator<Item = &'a f64>>(values: I) -> (f64, f64) {
+    let mut n = 0.0_f64;
+    let mut mean = 0.0_f64;
+    let mut m2 = 0.0_f64;
+    for &v in values {
+        n += 1.0;
+        let delta = v - mean;
+        mean += delta / n;
+        m2 += delta * (v - mean);
+    }
+    if n == 0.0 {
+        return (f64::NAN, f64::NAN);
+    }
+    (mean, m2 / n)
+}
+
+/// Entropy proxy over a borrowed slice: standard deviation of the values.
+fn entropy_of(energies: &[f64]) -> f64 {
+    mean_variance(energies).1.sqrt()
+}
+
+/// Nudge every value by uniform noise in ±(entropy·k), in place.
+fn step_in_place(energies: &mut [f64], k: f64) -> f64 {
+    let entropy = entropy_of(energies);
+    let adjustment = entropy * k;
+    if adjustment > 0.0 {
+        let mut rng = rand::thread_rng();
+        for e in energies.iter_mut() {
+            // small random nudge toward equilibrium
+            let noise: f64 = rng.gen_range(-adjustment..adjustment);
+            *e -= noise;
+        }
+    }
+    entropy
+}
 
 /// Compute entropy for a set of node energy states.
 /// Very simple proxy: standard deviation of the values.
 #[pyfunction]
 fn compute_entropy(energies: Vec<f64>) -> f64 {
-    let mean: f64 = energies.iter().sum::<f64>() / energies.len() as f64;
-    let variance: f64 = energies.iter().map(|e| (e - mean).powi(2)).sum::<f64>() / energies.len() as f64;
-    variance.sqrt()
+    entropy_of(&energies)
 }
 
 /// Perform one coherence step: adjust node energies to reduce entropy slightly.
 #[pyfunction]
 fn coherence_step(mut energies: Vec<f64>, k: f64) -> Vec<f64> {
-    // get current "entropy" magnitude
-    let entropy = compute_entropy(energies.clone());
-    let adjustment = entropy * k;
-
-    let mut rng = rand::thread_rng();
-    for e in energies.iter_mut() {
-        // small random nudge toward equilibrium
-        let noise: f64 = rng.gen_range(-adjustment..adjustment);
-        *e -= noise;
-    }
+    step_in_place(&mut energies, k);
     energies
 }
 
 /// Return system coherence index (0–1 where higher = more coherent)
 #[pyfunction]
 fn coherence_index(energies: Vec<f64>) -> f64 {
-    let entropy = compute_entropy(energies.clone());
+    (1.0 / (1.0 + entropy_of(&energies))).min(1.0)
+}
+
+// ---------- Zero-copy NumPy entry points ----------
+//
+// These borrow the array's buffer directly (no list conversion, no clone)
+// and release the GIL while the kernel runs. Contiguous arrays are walked
+// as flat slices; strided views fall back to an ndarray iterator.
+
+/// `compute_entropy` over a float64 NumPy array of any shape, read in place.
+#[pyfunction]
+fn compute_entropy_np(py: Python<'_>, energies: PyReadonlyArrayDyn<'_, f64>) -> f64 {
+    match energies.as_slice() {
+        Ok(s) => py.allow_threads(|| entropy_of(s)),
+        Err(_) => {
+            let view = energies.as_array();
+            py.allow_threads(|| mean_variance(view.iter()).1.sqrt())
+        }
+    }
+}
+
+/// `coherence_index` over a float64 NumPy array of any shape, read in place.
+#[pyfunction]
+fn coherence_index_np(py: Python<'_>, energies: PyReadonlyArrayDyn<'_, f64>) -> f64 {
+    let entropy = compute_entropy_np(py, energies);
     (1.0 / (1.0 + entropy)).min(1.0)
 }
 
+/// One coherence step applied to a float64 NumPy array in place.
+/// Returns the entropy measured before the step; allocates nothing.
+#[pyfunction]
+fn coherence_step_np(py: Python<'_>, mut energies: PyReadwriteArrayDyn<'_, f64>, k: f64) -> f64 {
+    match energies.as_slice_mut() {
+        Ok(s) => py.allow_threads(|| step_in_place(s, k)),
+        Err(_) => {
+            let mut view = energies.as_array_mut();
+            py.allow_threads(|| {
+                let entropy = mean_variance(view.iter()).1.sqrt();
+                let adjustment = entropy * k;
+                if adjustment > 0.0 {
+                    let mut rng = rand::thread_rng();
+                    for e in view.iter_mut() {
+                        let noise: f64 = rng.gen_range(-adjustment..adjustment);
+                        *e -= noise;
+                    }
+                }
+                entropy
+            })
+        }
+    }
+}
+
+/// One-pass field statistics: (mean, std, min, max, coherence_index).
+#[pyfunction]
+fn field_stats_np(py: Python<'_>, energies: PyReadonlyArrayDyn<'_, f64>) -> (f64, f64, f64, f64, f64) {
+    let view = energies.as_array();
+    py.allow_threads(|| {
+        let mut n = 0.0_f64;
+        let mut mean = 0.0_f64;
+        let mut m2 = 0.0_f64;
+        let mut lo = f64::INFINITY;
+        let mut hi = f64::NEG_INFINITY;
+        for &v in view.iter() {
+            n += 1.0;
+            let delta = v - mean;
+            mean += delta / n;
+            m2 += delta * (v - mean);
+            lo = lo.min(v);
+            hi = hi.max(v);
+        }
+        if n == 0.0 {
+            return (f64::NAN, f64::NAN, f64::NAN, f64::NAN, f64::NAN);
+        }
+        let std = (m2 / n).sqrt();
+        (mean, std, lo, hi, (1.0 / (1.0 + std)).min(1.0))
+    })
+}
+
+// ---------- Seeded, parallel stepping ----------
+//
+// Noise comes from a counter-based generator: every value is a pure
+// function of (seed, stream, step, element index). Statistics are reduced
+// over fixed-size chunks and merged in chunk order. Together this makes
+// results bit-identical for any thread count or scheduling.
+
+const STAT_CHUNK: usize = 1 << 14;
+
+#[inline]
+fn splitmix64(mut z: u64) -> u64 {
+    z = z.wrapping_add(0x9E37_79B9_7F4A_7C15);
+    z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+    z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+    z ^ (z >> 31)
+}
+
+#[inline]
+fn stream_key(seed: u64, stream: u64, step: u64) -> u64 {
+    splitmix64(seed ^ splitmix64(stream ^ splitmix64(step)))
+}
+
+/// Uniform noise in (-1, 1) for element `idx` of a keyed stream.
+#[inline]
+fn counter_noise(key: u64, idx: u64) -> f64 {
+    let bits = splitmix64(key ^ idx.wrapping_mul(0xD1B5_4A32_D192_ED03));
+    let u = (bits >> 11) as f64 * (1.0 / (1u64 << 53) as f64);
+    2.0 * u - 1.0
+}
+
+/// Chan et al. merge of per-chunk (n, mean, m2) in a fixed order.
+fn chunked_std(values: &[f64]) -> f64 {
+    let parts: Vec<(f64, f64, f64)> = values
+        .par_chunks(STAT_CHUNK)
+        .map(|c| {
+            let (mean, var) = mean_variance(c);
+            let n = c.len() as f64;
+            (n, mean, var * n)
+        })
+        .collect();
+    let (mut n, mut mean, mut m2) = (0.0_f64, 0.0_f64, 0.0_f64);
+    for (nb, mb, m2b) in parts {
+        let total = n + nb;
+        let delta = mb - mean;
+        mean += delta * nb / total;
+        m2 += m2b + delta * delta * n * nb / total;
+        n = total;
+    }
+    if n == 0.0 { f64::NAN } else { (m2 / n).sqrt() }
+}
+
+/// Seeded coherence step over one slice; returns the pre-step entropy.
+fn seeded_step(values: &mut [f64], k: f64, key: u64) -> f64 {
+    let entropy = chunked_std(values);
+    let adjustment = entropy * k;
+    if adjustment > 0.0 {
+        values
+            .par_chunks_mut(STAT_CHUNK)
+            .enumerate()
+            .for_each(|(ci, chunk)| {
+                let base = (ci * STAT_CHUNK) as u64;
+                for (j, e) in chunk.iter_mut().enumerate() {
+                    *e -= adjustment * counter_noise(key, base + j as u64);
+                }
+            });
+    }
+    entropy
+}
+
+/// One pool per requested thread count, built on first use and kept for the
+/// life of the process (building a pool spawns its threads every time).
+/// `threads=None` runs on rayon's global pool, sized by RAYON_NUM_THREADS.
+fn pool_for(n: usize) -> PyResult<Arc<rayon::ThreadPool>> {
+    static POOLS: OnceLock<Mutex<HashMap<usize, Arc<rayon::ThreadPool>>>> = OnceLock::new();
+    let mut pools = POOLS
+        .get_or_init(|| Mutex::new(HashMap::new()))
+        .lock()
+        .unwrap_or_else(|e| e.into_inner());
+    if let Some(pool) = pools.get(&n) {
+        return Ok(pool.clone());
+    }
+    let pool = rayon::ThreadPoolBuilder::new()
+        .num_threads(n)
+        .build()
+        .map(Arc::new)
+        .map_err(|e| PyValueError::new_err(e.to_string()))?;
+    pools.insert(n, pool.clone());
+    Ok(pool)
+}
+
+fn with_threads<T: Send>(threads: Option<usize>, f: impl FnOnce() -> T + Send) -> PyResult<T> {
+    match threads {
+        None => Ok(f()),
+        Some(n) => Ok(pool_for(n)?.install(f)),
+    }
+}
+
+/// Seeded, parallel coherence step on one large field, in place.
+/// Chunks of the field are stepped on a work-stealing pool.
+#[pyfunction]
+#[pyo3(signature = (energies, k, seed, step, threads=None))]
+fn coherence_step_seeded_np(
+    py: Python<'_>,
+    mut energies: PyReadwriteArrayDyn<'_, f64>,
+    k: f64,
+    seed: u64,
+    step: u64,
+    threads: Option<usize>,
+) -> PyResult<f64> {
+    let values = energies
+        .as_slice_mut()
+        .map_err(|_| PyValueError::new_err("energies must be C-contiguous"))?;
+    let key = stream_key(seed, 0, step);
+    py.allow_threads(|| with_threads(threads, || seeded_step(values, k, key)))
+}
+
+/// Seeded, parallel coherence step over many fields, each in place.
+/// Field `i` draws from stream `i`; returns the pre-step entropies.
+#[pyfunction]
+#[pyo3(signature = (fields, k, seed, step, threads=None))]
+fn coherence_step_batch_np(
+    py: Python<'_>,
+    mut fields: Vec<PyReadwriteArrayDyn<'_, f64>>,
+    k: f64,
+    seed: u64,
+    step: u64,
+    threads: Option<usize>,
+) -> PyResult<Vec<f64>> {
+    let mut slices: Vec<&mut [f64]> = Vec::with_capacity(fields.len());
+    for f in fields.iter_mut() {
+        slices.push(
+            f.as_slice_mut()
+                .map_err(|_| PyValueError::new_err("every field must be C-contiguous"))?,
+        );
+    }
+    py.allow_threads(|| {
+        with_threads(threads, || {
+            slices
+                .par_iter_mut()
+                .enumerate()
+                .map(|(i, s)| seeded_step(s, k, stream_key(seed, i as u64, step)))
+                .collect()
+        })
+    })
+}
+
 /// Python module init
 #[pymodule]
 fn xcfc(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(compute_entropy, m)?)?;
     m.add_function(wrap_pyfunction!(coherence_step, m)?)?;
     m.add_function(wrap_pyfunction!(coherence_index, m)?)?;
+    m.add_function(wrap_pyfunction!(compute_entropy_np, m)?)?;
+    m.add_function(wrap_pyfunction!(coherence_index_np, m)?)?;
+    m.add_function(wrap_pyfunction!(coherence_step_np, m)?)?;
+    m.add_function(wrap_pyfunction!(field_stats_np, m)?)?;
+    m.add_function(wrap_pyfunction!(coherence_step_seeded_np, m)?)?;
+    m.add_function(wrap_pyfunction!(coherence_step_batch_np, m)?)?;
     Ok(())
 }
@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 # v3.5.5 Bridge — WebSocket hub for Xyllidium
-import asyncio, json, websockets
+import asyncio, json, os, websockets
 from websockets.server import WebSocketServerProtocol
 
+try:
+    from core.readiness import notify_ready
+    from core import tracing
+except ImportError:  # launched as a bare script outside the repo root
+    def notify_ready(*a, **k): return False
+    tracing = None
+
+PORT = int(os.environ.get("XYLL_BRIDGE_PORT", "8765"))
+
 CLIENTS:set[WebSocketServerProtocol] = set()
 
 async def broadcast(message: str, sender: WebSocketServerProtocol|None=None):
@@ -25,8 +34,14 @@ async def handler(ws: WebSocketServerProtocol):
         async for msg in ws:
             # We relay any well-formed JSON payload to all peers
             try:
-                json.loads(msg)  # sanity check
-                await broadcast(msg, sender=ws)
+                payload = json.loads(msg)  # sanity check
+                # traced intents keep their envelope on the wire for downstream peers
+                ctx = tracing.extract(dict(payload)) if tracing and isinstance(payload, dict) else None
+                if ctx:
+                    with tracing.span("bridge.broadcast", parent=ctx, clients=len(CLIENTS)):
+                        await broadcast(msg, sender=ws)
+                else:
+                    await broadcast(msg, sender=ws)
             except Exception:
                 # non-JSON: wrap it
                 await broadcast(json.dumps({"type":"raw","data":msg}), sender=ws)
@@ -34,8 +49,11 @@ async def handler(ws: WebSocketServerProtocol):
         CLIENTS.discard(ws)
 
 async def main():
-    print("🌉 Bridge server @ ws://127.0.0.1:8765")
-    async with websockets.serve(handler, "127.0.0.1", 8765, max_size=2**23):
+    if tracing:
+        tracing.set_service("bridge")
+    print(f"🌉 Bridge server @ ws://127.0.0.1:{PORT}")
+    async with websockets.serve(handler, "127.0.0.1", PORT, max_size=2**23):
+        notify_ready("bridge", port=PORT)
         await asyncio.Future()  # run forever
 
 if __name__ == "__main__":
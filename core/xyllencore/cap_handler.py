@@ -4,6 +4,10 @@ from datetime import datetime, timezone
 from typing import Dict, Any
 from pathlib import Path
 
+from core.xyllencore.merkle_log import get_log
+from core.xyllencore.record_cache import get_cache
+from core.xyllencore.vault_index import get_index
+
 # ------------------------------------------------------------------
 # FIXED BASE PATH (always absolute within repo)
 # ------------------------------------------------------------------
@@ -39,8 +43,16 @@ def make_anchor_payload(intent: Dict[str, Any]) -> Dict[str, Any]:
 
 def store_anchor(record: Dict[str, Any]) -> str:
     path = _cap_path(record["id"])
-    with open(path, "w") as f:
-        json.dump(record, f, indent=2)
+    index = get_index()
+    # answered from memory (a miss may cost one stat)
+    if index.anchored(record, "cap"):
+        return str(path)  # same intent, already anchored and live
+    index.check_prefix(record)
+    with index.writing(record, "cap"):
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2)
+    get_cache().invalidate(path)
+    get_log().append(record)
     return str(path)
 
 def list_caps() -> list[Dict[str, Any]]:
@@ -53,13 +65,18 @@ def list_caps() -> list[Dict[str, Any]]:
     return caps
 
 def load_cap(cap_id: str) -> Dict[str, Any] | None:
-    """Load a CAP or stub."""
-    path = _cap_path(cap_id)
-    if path.exists():
-        with open(path) as f: return json.load(f)
-    sp = _stub_path(cap_id)
-    if sp.exists():
-        with open(sp) as f: return json.load(f)
+    """Load a CAP or stub. Unknown ids are answered from the index, without disk."""
+    kind = get_index().locate(cap_id)
+    if kind is None:
+        return None
+    cache = get_cache()
+    first = _stub_path(cap_id) if kind == "stub" else _cap_path(cap_id)
+    # index out of date (e.g. another process decayed it): fall back to probing
+    for path in (first, _cap_path(cap_id), _stub_path(cap_id)):
+        try:
+            return cache.load(path)
+        except FileNotFoundError:
+            continue
     return None
 
 def write_decayed_stub(cap: Dict[str, Any]):
@@ -79,8 +96,10 @@ def write_decayed_stub(cap: Dict[str, Any]):
             "amount": cap["intent"].get("amount"),
         }
     }
-    with open(_stub_path(cap["id"]), "w") as f:
-        json.dump(stub, f, indent=2)
+    with get_index().writing(stub, "stub"):
+        with open(_stub_path(cap["id"]), "w") as f:
+            json.dump(stub, f, indent=2)
+    get_cache().invalidate(_stub_path(cap["id"]))
 
 def decay_non_permanent(ttl_seconds: int = 3600) -> int:
     """Remove non-permanent CAPs older than TTL."""
@@ -97,18 +116,21 @@ def decay_non_permanent(ttl_seconds: int = 3600) -> int:
         age = now - os.stat(path).st_mtime
         if age >= ttl_seconds:
             write_decayed_stub(cap)
-            try: os.remove(path)
-            except FileNotFoundError: pass
+            try:
+                with get_index().changing():
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            get_cache().invalidate(path)
             decayed += 1
     return decayed
 
 def reconstruct_from_stub(cap_id: str) -> Dict[str, Any] | None:
     """Regenerate a decayed CAP from its stub metadata."""
-    sp = _stub_path(cap_id)
-    if not sp.exists():
+    try:
+        stub = get_cache().load(_stub_path(cap_id))
+    except FileNotFoundError:
         return None
-    with open(sp) as f:
-        stub = json.load(f)
     intent = {
         "id": f"REGEN-{cap_id[4:]}",
         "type": stub["hint"].get("type"),
@@ -1,22 +1,24 @@
 # ~/work/xyllidium/core/xyllencore/executor.py
 import os, sys, time, json, hashlib, datetime, logging, socket
-import argparse, requests, asyncio
-import websockets
+import argparse
 
-from core.xyllenor.xap_handler import make_xap
+from core import tracing
+
+# requests, websockets, asyncio and nacl (via xap_handler) are imported on
+# the paths that use them; see scripts/import_budget.py
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger(__name__)
 
-WS_URI = "ws://127.0.0.1:8765"
-HTTP_API = "http://127.0.0.1:8766"
+WS_URI = os.environ.get("XYLL_ENGINE_WS", "ws://127.0.0.1:8765")
+HTTP_API = os.environ.get("XYLL_ENGINE_HTTP", "http://127.0.0.1:8766")
 
 def generate_txn_id(intent):
     data = f"{intent['from']}{intent['to']}{intent['timestamp']}".encode()
     digest = hashlib.sha256(data).hexdigest()[:8].upper()
     return f"XYLL-TXN-{digest}"
 
-def wait_for_ws(host="127.0.0.1", port=8765, timeout=8):
+def wait_for_ws(host="127.0.0.1", port=int(WS_URI.rsplit(":", 1)[1]), timeout=8):
     start = time.time()
     while time.time() - start < timeout:
         try:
@@ -27,21 +29,26 @@ def wait_for_ws(host="127.0.0.1", port=8765, timeout=8):
     return False
 
 async def send_ws(intent):
+    import websockets
     async with websockets.connect(WS_URI, max_size=2**23) as ws:
         await ws.send(json.dumps(intent))
         ack = await ws.recv()
         return ack
 
 def try_ws(intent):
+    import asyncio
     try:
-        return asyncio.get_event_loop().run_until_complete(send_ws(intent))
+        with tracing.span("send_ws"):
+            return asyncio.get_event_loop().run_until_complete(send_ws(tracing.inject(intent)))
     except Exception as e:
         log.error(f"⚠️ WebSocket send failed: {e}")
         return None
 
 def try_http_fallback(intent):
+    import requests
     try:
-        r = requests.post(f"{HTTP_API}/apply_intent", json=intent, timeout=3)
+        with tracing.span("http_fallback"):
+            r = requests.post(f"{HTTP_API}/apply_intent", json=tracing.inject(intent), timeout=3)
         if r.ok and r.json().get("ok"):
             return {"ok": True, "via": "http"}
         return {"ok": False, "via": "http", "error": r.text}
@@ -71,7 +78,15 @@ def main():
     ap.add_argument("--permanent", action="store_true", default=True)
     args = ap.parse_args()
 
-    intent = build_intent(args.sender, args.receiver, args.amount, args.unit, args.permanent)
+    tracing.set_service("executor")
+    with tracing.span("executor.run", root=True, amount=args.amount):
+        run(args)
+
+def run(args):
+    with tracing.span("build_intent"):
+        intent = build_intent(args.sender, args.receiver, args.amount, args.unit, args.permanent)
+    if tracing.current_trace_id():
+        log.info(f"🧵 trace {tracing.current_trace_id()}")
     log.info(f"⚙️ Executing intent: {args.sender} → {args.receiver}, {args.amount} {args.unit}")
 
     delivered = False
@@ -92,12 +107,14 @@ def main():
             log.info("✅ Intent applied via HTTP fallback.")
 
     # Always anchor
+    from core.xyllenor.xap_handler import make_xap
     log.info("🧩 Anchoring permanent transaction via XAP...")
     xap = make_xap(intent)
     # You likely already print the XAP record inside make_xap or after; repeating here for clarity:
     print(json.dumps(xap, indent=2, ensure_ascii=False))
 
     # Show balances
+    import requests
     try:
         a = requests.get(f"{HTTP_API}/balance/{args.sender}", timeout=2).json()["balance"]
         b = requests.get(f"{HTTP_API}/balance/{args.receiver}", timeout=2).json()["balance"]
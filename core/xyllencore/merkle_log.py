@@ -0,0 +1,297 @@
+# ~/work/xyllidium/core/xyllencore/merkle_log.py
+"""
+Append-only Merkle log over anchored records (RFC 6962-style hashing).
+
+- Leaves are sha256(0x00 || entropy hash) in anchoring order; nodes are
+  sha256(0x01 || left || right)
+- Every perfect subtree is kept in memory, so roots and inclusion proofs
+  cost O(log n) hashes
+- `.merkle_log` next to the vault is the source of truth: fixed 64-byte
+  records (leaf || id), appended under an exclusive file lock, so the
+  engine and executor processes share one log
+- Every ROOT_EVERY appends a root is signed with the node key and
+  appended to `.merkle_roots` (JSON lines). The latest signed root is
+  kept in memory; refresh() reads only what other processes appended
+- Records whose entropy hash isn't hex are logged and left out of the tree
+"""
+import os, json, fcntl, hashlib, logging, threading, datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from core.xyllencore.vault_index import BASE, normalize_hash
+
+LOG_FILE = ".merkle_log"
+ROOTS_FILE = ".merkle_roots"
+RECORD = 64          # 32-byte leaf hash + 32-byte NUL-padded id
+ROOT_EVERY = 64
+ROOTS_TAIL = 4096    # bytes read from the end of .merkle_roots on startup
+
+log = logging.getLogger("merkle_log")
+
+
+def _h(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def leaf_hash(entropy_hash: str) -> bytes:
+    return _h(b"\x00" + bytes.fromhex(normalize_hash(entropy_hash)))
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return _h(b"\x01" + left + right)
+
+
+def _split(n: int) -> int:
+    """Largest power of two strictly less than n (n >= 2)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def verify_inclusion(leaf: bytes, index: int, size: int, path: List[bytes], root: bytes) -> bool:
+    """RFC 9162 §2.1.3.2 inclusion check."""
+    if index >= size:
+        return False
+    fn, sn, r = index, size - 1, leaf
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+class MerkleLog:
+    def __init__(self, base: Path = BASE, root_every: int = ROOT_EVERY):
+        self.base = Path(base)
+        self.path = self.base / LOG_FILE
+        self.roots_path = self.base / ROOTS_FILE
+        self.root_every = root_every
+        self.levels: List[List[bytes]] = [[]]
+        self.ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._signed: Optional[Dict[str, Any]] = None   # latest signed root
+        self._roots_pos = 0                             # .merkle_roots bytes consumed
+        self.path.touch(exist_ok=True)
+        with open(self.path, "rb") as f:
+            self._catch_up(f)
+        tail = ROOTS_TAIL
+        while True:  # widen the tail until it holds one complete line
+            self._roots_pos = 0
+            self._catch_up_roots(tail=tail)
+            if self._signed is not None or tail >= self._roots_size():
+                break
+            tail *= 2
+
+    @property
+    def size(self) -> int:
+        return len(self.levels[0])
+
+    # ---- tree maintenance ----
+
+    def _push(self, leaf: bytes, rec_id: str):
+        idx = self.size
+        self.levels[0].append(leaf)
+        self.ids.setdefault(rec_id, idx)
+        k = 0
+        while idx & 1:
+            left, right = self.levels[k][idx - 1], self.levels[k][idx]
+            if len(self.levels) == k + 1:
+                self.levels.append([])
+            self.levels[k + 1].append(node_hash(left, right))
+            idx >>= 1
+            k += 1
+
+    def _catch_up(self, f):
+        """Load records appended (possibly by other processes) past our size."""
+        f.seek(self.size * RECORD)
+        while True:
+            rec = f.read(RECORD)
+            if len(rec) < RECORD:
+                return
+            self._push(rec[:32], rec[32:].rstrip(b"\0").decode())
+
+    def _roots_size(self) -> int:
+        try:
+            return os.path.getsize(self.roots_path)
+        except FileNotFoundError:
+            return 0
+
+    def _catch_up_roots(self, tail: Optional[int] = None):
+        """Pick up signed roots appended past what we've read (complete lines only)."""
+        try:
+            with open(self.roots_path, "rb") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end < self._roots_pos:  # file replaced: start over
+                    self._roots_pos = 0
+                if tail is not None:
+                    self._roots_pos = max(self._roots_pos, end - tail)
+                f.seek(self._roots_pos)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        done = chunk.rfind(b"\n") + 1
+        lines = chunk[:done].splitlines()
+        self._roots_pos += done
+        for line in reversed(lines):
+            try:
+                self._signed = json.loads(line)
+                return
+            except ValueError:
+                continue  # first line of a tail read may be cut
+
+    def append(self, record: Dict[str, Any]) -> Optional[int]:
+        """Add an anchored record's entropy hash; returns its leaf index."""
+        rec_id, eh = record.get("id"), record.get("entropy_hash")
+        if not rec_id or not eh:
+            return None
+        try:
+            leaf = leaf_hash(eh)
+        except ValueError:
+            # the record is already in the vault; don't fail its writer
+            log.warning(f"⚠️ {rec_id}: entropy hash is not hex, not added to the Merkle log")
+            return None
+        with self._lock, open(self.path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._catch_up(f)
+                if rec_id in self.ids:
+                    return self.ids[rec_id]
+                f.seek(0, os.SEEK_END)
+                f.write(leaf + rec_id.encode()[:32].ljust(32, b"\0"))
+                f.flush()
+                self._push(leaf, rec_id)
+                idx = self.size - 1
+                if self.size % self.root_every == 0:
+                    try:
+                        self._sign_root()
+                    except Exception as e:
+                        log.warning(f"⚠️ could not sign Merkle root at size {self.size}: {e}")
+                return idx
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def refresh(self):
+        with self._lock, open(self.path, "rb") as f:
+            self._catch_up(f)
+            self._catch_up_roots()
+
+    # ---- hashing over ranges ----
+
+    def _mth(self, lo: int, hi: int) -> bytes:
+        n = hi - lo
+        if n == 0:
+            return _h(b"")
+        k = n.bit_length() - 1
+        if n == 1 << k and lo % n == 0:
+            return self.levels[k][lo >> k]
+        s = _split(n)
+        return node_hash(self._mth(lo, lo + s), self._mth(lo + s, hi))
+
+    def root(self, size: Optional[int] = None) -> bytes:
+        return self._mth(0, self.size if size is None else size)
+
+    def _path(self, m: int, lo: int, hi: int) -> List[bytes]:
+        if hi - lo <= 1:
+            return []
+        s = _split(hi - lo)
+        if m < lo + s:
+            return self._path(m, lo, lo + s) + [self._mth(lo + s, hi)]
+        return self._path(m, lo + s, hi) + [self._mth(lo, lo + s)]
+
+    # ---- signed roots ----
+
+    def _sign_root(self) -> Dict[str, Any]:
+        from nacl.signing import SigningKey
+        from nacl.encoding import HexEncoder
+        from core.xyllenor.xap_handler import load_keys
+
+        priv_hex, pub_hex, node_id = load_keys()
+        size, root = self.size, self.root().hex().upper()
+        msg = f"XYLL-MROOT|{size}|{root}".encode()
+        sig = SigningKey(bytes.fromhex(priv_hex)).sign(msg, encoder=HexEncoder).signature.decode()
+        entry = {
+            "size": size,
+            "root": root,
+            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "signer": node_id,
+            "public_key": f"XYLL-PUB-{pub_hex}",
+            "signature": f"XYLL-SIG-{sig.upper()}",
+        }
+        with open(self.roots_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        self._catch_up_roots()  # consumes our line (and any before it)
+        self._signed = entry
+        return entry
+
+    def sign_root(self) -> Dict[str, Any]:
+        """Sign the current root now (e.g. on shutdown or on request)."""
+        with self._lock:
+            return self._sign_root()
+
+    def latest_signed_root(self, min_size: int = 0) -> Optional[Dict[str, Any]]:
+        """From memory; call refresh() first to see roots other processes signed."""
+        entry = self._signed
+        return entry if entry is not None and entry["size"] >= min_size else None
+
+    # ---- proofs ----
+
+    def inclusion_proof(self, anchor_id: str) -> Optional[Dict[str, Any]]:
+        """
+        O(log n) proof that `anchor_id` is in the log. Proves against the
+        latest signed root when it already covers the leaf, else against
+        the current (unsigned) root.
+        """
+        self.refresh()
+        idx = self.ids.get(anchor_id)
+        if idx is None:
+            return None
+        signed = self.latest_signed_root(min_size=idx + 1)
+        size = signed["size"] if signed else self.size
+        return {
+            "id": anchor_id,
+            "index": idx,
+            "tree_size": size,
+            "leaf": self.levels[0][idx].hex().upper(),
+            "path": [p.hex().upper() for p in self._path(idx, 0, size)],
+            "root": self.root(size).hex().upper(),
+            "signed_root": signed,
+        }
+
+
+def backfill(mlog: MerkleLog, base: Path = BASE) -> int:
+    """Append vault records missing from the log, oldest first (first run / recovery)."""
+    recs = []
+    for fn in os.listdir(base):
+        if fn.startswith(("XAP-", "CAP-")) and fn.endswith(".json") and not fn.endswith(".stub.json"):
+            try:
+                with open(base / fn) as f:
+                    rec = json.load(f)
+            except Exception:
+                continue
+            if rec.get("id") not in mlog.ids:
+                recs.append(rec)
+    recs.sort(key=lambda r: str(r.get("timestamp", "")))
+    for rec in recs:
+        mlog.append(rec)
+    return len(recs)
+
+
+_LOG: Optional[MerkleLog] = None
+_LOG_LOCK = threading.Lock()
+
+
+def get_log() -> MerkleLog:
+    global _LOG
+    with _LOG_LOCK:
+        if _LOG is None:
+            BASE.mkdir(parents=True, exist_ok=True)
+            _LOG = MerkleLog(BASE)
+            if _LOG.size == 0:
+                backfill(_LOG)
+        return _LOG
@@ -0,0 +1,90 @@
+# ~/work/xyllidium/core/xyllencore/record_cache.py
+"""
+Shared LRU cache of parsed TimeVault records.
+
+- Keyed by absolute file path; holds at most `maxsize` records
+  (XYLL_RECORD_CACHE_SIZE, default 4096)
+- Writers in this process (store_xap, make_xap, store_anchor, stubs,
+  reinforce_record, decay) call invalidate() after touching a file
+- Every hit is checked against the file's (mtime_ns, size), so records
+  rewritten or deleted by another process are never served stale
+- Cached records are shared: treat them as read-only
+"""
+import os, json, threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+DEFAULT_SIZE = int(os.environ.get("XYLL_RECORD_CACHE_SIZE", "4096"))
+
+
+class RecordCache:
+    def __init__(self, maxsize: int = DEFAULT_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.stale = self.evictions = 0
+
+    def load(self, path) -> Dict[str, Any]:
+        """Parsed JSON at `path`; raises like open()/json.load on missing or bad files."""
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            self.invalidate(key)
+            raise
+        sig = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            ent = self._data.get(key)
+            if ent is not None and ent[0] == sig:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return ent[1]
+            if ent is not None:
+                self.stale += 1
+            self.misses += 1
+
+        with open(key, "r", encoding="utf-8") as f:
+            rec = json.load(f)
+        # a rewrite racing this read leaves an old sig on new data: it just misses next time
+        with self._lock:
+            self._data[key] = (sig, rec)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return rec
+
+    def invalidate(self, *paths):
+        with self._lock:
+            for p in paths:
+                self._data.pop(os.path.abspath(p), None)
+
+    def invalidate_id(self, base, rec_id: str):
+        """Drop both the record and its decay stub."""
+        self.invalidate(os.path.join(base, f"{rec_id}.json"), os.path.join(base, f"{rec_id}.stub.json"))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data), "maxsize": self.maxsize,
+                "hits": self.hits, "misses": self.misses, "stale": self.stale,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_CACHE: Optional[RecordCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> RecordCache:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = RecordCache()
+        return _CACHE
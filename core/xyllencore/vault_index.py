@@ -0,0 +1,336 @@
+# ~/work/xyllidium/core/xyllencore/vault_index.py
+"""
+In-memory existence index over the TimeVault.
+
+- Bloom filter over every record id and entropy hash (negative lookups
+  never touch disk)
+- Sorted array of 64-bit entropy-hash prefixes (exact membership and
+  12-char id-prefix collision checks by binary search)
+- id -> record kind ("cap" | "stub" | "xap"), so loaders open the right
+  file on the first try
+- a miss costs one stat of the vault directory: if its mtime moved since
+  our last scan (another process wrote or deleted a record) we sync()
+  before answering. Our own writes (`writing()`, `flush()`) advance the
+  stamp, so they don't trigger that sync
+
+Persisted next to the vault as `.vault_index` (not *.json, so vault
+listings ignore it). If the vault directory changed behind our back (a
+crash or SIGTERM before the last flush, another process) the persisted
+index is loaded and brought up to date with an incremental sync().
+"""
+import os, json, struct, hashlib, threading
+from contextlib import contextmanager
+from array import array
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BASE = REPO_ROOT / "data" / "timevault"
+INDEX_FILE = ".vault_index"
+INDEX_VERSION = 1
+
+_ENTR_PREFIX = "XYLL-ENTR-"
+
+
+def normalize_hash(h: str) -> str:
+    """CAP hashes are lowercase hex, XAP hashes 'XYLL-ENTR-' + uppercase; unify."""
+    h = h.strip()
+    if h.startswith(_ENTR_PREFIX):
+        h = h[len(_ENTR_PREFIX):]
+    return h.lower()
+
+
+def _prefix64(h: str) -> Optional[int]:
+    """First 64 bits of the hash, or None if it isn't hex (nothing to index)."""
+    try:
+        return int(normalize_hash(h)[:16].ljust(16, "0"), 16)
+    except ValueError:
+        return None
+
+
+def _kind_of(filename: str) -> Optional[str]:
+    if filename.endswith(".stub.json"):
+        return "stub"
+    if filename.startswith("CAP-") and filename.endswith(".json"):
+        return "cap"
+    if filename.startswith("XAP-") and filename.endswith(".json"):
+        return "xap"
+    return None
+
+
+class BloomFilter:
+    def __init__(self, m_bits: int = 1 << 20, k: int = 7, bits: Optional[bytearray] = None):
+        self.m = m_bits
+        self.k = k
+        self.bits = bits if bits is not None else bytearray(m_bits // 8)
+
+    def _positions(self, key: str):
+        d = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", d)
+        for i in range(self.k):
+            yield (h1 + i * h2) % self.m
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class VaultIndex:
+    def __init__(self, base: Path = BASE, m_bits: int = 1 << 20, k: int = 7):
+        self.base = Path(base)
+        self.path = self.base / INDEX_FILE
+        self._m_bits, self._k = m_bits, k
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._seen_mtime_ns = -1   # vault dir mtime as of our last scan/load
+        if not self._load():
+            self.rebuild()
+        elif self._seen_mtime_ns != self._dir_mtime():
+            self.sync()
+
+    # ---- build / persist ----
+
+    def _reset(self):
+        self.bloom = BloomFilter(self._m_bits, self._k)
+        self.hashes = array("Q")
+        self.kinds: Dict[str, str] = {}
+
+    def rebuild(self):
+        """Full directory scan; the only path that reads every record."""
+        with self._lock:
+            self._reset()
+            self._seen_mtime_ns = self._dir_mtime()
+            for fn in os.listdir(self.base):
+                kind = _kind_of(fn)
+                if kind is None:
+                    continue
+                try:
+                    with open(self.base / fn) as f:
+                        rec = json.load(f)
+                except Exception:
+                    continue
+                self._add(rec, kind)
+            self._dirty = True
+            self.flush()
+
+    def sync(self) -> int:
+        """
+        Pick up records written or deleted by other processes: one directory
+        listing, and only unknown files are read. Returns files added.
+        """
+        with self._lock:
+            # stamp before listing: a file created mid-scan bumps it again
+            self._seen_mtime_ns = self._dir_mtime()
+            present = {}
+            for fn in os.listdir(self.base):
+                kind = _kind_of(fn)
+                if kind is not None:
+                    present[fn[:-len(".stub.json")] if kind == "stub" else fn[:-len(".json")]] = (fn, kind)
+            added = 0
+            for rid, (fn, kind) in present.items():
+                if self.kinds.get(rid) == kind:
+                    continue
+                try:
+                    with open(self.base / fn) as f:
+                        self._add(json.load(f), kind)
+                    added += 1
+                except Exception:
+                    continue
+            for rid in [r for r in self.kinds if r not in present]:
+                self.discard(rid)
+            return added
+
+    def _load(self) -> bool:
+        try:
+            with open(self.path, "rb") as f:
+                (hlen,) = struct.unpack("<I", f.read(4))
+                meta = json.loads(f.read(hlen))
+                if meta.get("version") != INDEX_VERSION:
+                    return False
+                bits = bytearray(f.read(meta["m"] // 8))
+                hashes = array("Q")
+                hashes.frombytes(f.read(meta["n_hashes"] * 8))
+        except (OSError, ValueError, KeyError, struct.error):
+            return False
+        self.bloom = BloomFilter(meta["m"], meta["k"], bits)
+        self.hashes = hashes
+        self.kinds = meta["kinds"]
+        self._seen_mtime_ns = meta["vault_mtime_ns"]
+        return True
+
+    def _dir_mtime(self) -> int:
+        return os.stat(self.base).st_mtime_ns
+
+    @contextmanager
+    def changing(self):
+        """
+        Wrap a change this process makes to the vault dir (see writing(),
+        removing()). If nothing else
+        had changed it since our last scan, advance the stamp past our own
+        change so the next miss doesn't sync(). A foreign write landing
+        inside the window is picked up by the next explicit sync().
+        """
+        with self._lock:
+            clean = self._dir_mtime() == self._seen_mtime_ns
+            yield
+            if clean:
+                self._seen_mtime_ns = self._dir_mtime()
+
+    @contextmanager
+    def writing(self, rec: Dict[str, Any], kind: str):
+        """Write a vault record inside this block; it is indexed on success."""
+        with self.changing():
+            yield
+            self._add(rec, kind)
+
+    @contextmanager
+    def removing(self, rec_id: str):
+        """Delete a vault record inside this block; it is discarded on success."""
+        with self.changing():
+            yield
+            self.discard(rec_id)
+
+    def _changed_on_disk(self) -> bool:
+        """
+        One stat: did any process create or delete a vault file since our
+        last scan? If so, sync() and report True so the caller can retry.
+        """
+        try:
+            if self._dir_mtime() == self._seen_mtime_ns:
+                return False
+        except OSError:
+            return False
+        self.sync()
+        return True
+
+    def flush(self):
+        """Persist the index if it changed since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_name(INDEX_FILE + ".tmp")
+            with self.changing():
+                with open(tmp, "wb") as f:
+                    meta = {
+                        "version": INDEX_VERSION,
+                        "m": self.bloom.m, "k": self.bloom.k,
+                        "n_hashes": len(self.hashes),
+                        "kinds": self.kinds,
+                    }
+                    self._write(f, meta)
+                os.replace(tmp, self.path)
+            # the stamp a later load compares against: the post-replace dir mtime,
+            # unless something else changed the vault since our last scan
+            meta["vault_mtime_ns"] = self._seen_mtime_ns
+            with open(self.path, "r+b") as f:
+                self._write(f, meta)
+            self._dirty = False
+
+    def _write(self, f, meta: Dict[str, Any]):
+        head = json.dumps(meta).encode()
+        f.write(struct.pack("<I", len(head)))
+        f.write(head)
+        f.write(self.bloom.bits)
+        f.write(self.hashes.tobytes())
+        f.truncate()
+
+    # ---- updates ----
+
+    def _add(self, rec: Dict[str, Any], kind: str):
+        rid = rec.get("id")
+        eh = rec.get("entropy_hash")
+        if rid:
+            self.bloom.add(rid)
+            self.kinds[rid] = kind
+        if eh:
+            nh = normalize_hash(eh)
+            self.bloom.add(nh)
+            p = _prefix64(nh)
+            if p is not None:
+                i = bisect_left(self.hashes, p)
+                if i == len(self.hashes) or self.hashes[i] != p:
+                    insort(self.hashes, p)
+        self._dirty = True
+
+    def add(self, rec: Dict[str, Any], kind: str):
+        with self._lock:
+            self._add(rec, kind)
+
+    def discard(self, rec_id: str):
+        """Record file deleted (decay). Its hash stays: the intent was still seen."""
+        with self._lock:
+            if self.kinds.pop(rec_id, None) is not None:
+                self._dirty = True
+
+    # ---- queries (memory, plus one stat on a miss) ----
+
+    def _locate(self, rec_id: str) -> Optional[str]:
+        if rec_id not in self.bloom:
+            return None
+        return self.kinds.get(rec_id)
+
+    def locate(self, rec_id: str) -> Optional[str]:
+        """'cap' | 'stub' | 'xap' for a live record, else None."""
+        kind = self._locate(rec_id)
+        if kind is None and self._changed_on_disk():
+            kind = self._locate(rec_id)
+        return kind
+
+    def _seen_hash(self, nh: str) -> bool:
+        if nh not in self.bloom:
+            return False
+        p = _prefix64(nh)
+        if p is None:
+            return False
+        i = bisect_left(self.hashes, p)
+        return i < len(self.hashes) and self.hashes[i] == p
+
+    def seen_hash(self, entropy_hash: str) -> bool:
+        nh = normalize_hash(entropy_hash)
+        if self._seen_hash(nh):
+            return True
+        return self._changed_on_disk() and self._seen_hash(nh)
+
+    def prefix_collisions(self, entropy_hash: str) -> List[str]:
+        """Other known hashes (as 16-hex prefixes) sharing the 12-char id prefix."""
+        p = _prefix64(entropy_hash)
+        if p is None:
+            return []
+        lo = p & ~0xFFFF
+        i = bisect_left(self.hashes, lo)
+        out = []
+        while i < len(self.hashes) and self.hashes[i] <= lo | 0xFFFF:
+            if self.hashes[i] != p:
+                out.append(f"{self.hashes[i]:016x}")
+            i += 1
+        return out
+
+    def anchored(self, rec: Dict[str, Any], kind: str) -> bool:
+        """Is this intent already anchored as a live `kind` record under the same id?"""
+        eh = rec.get("entropy_hash")
+        return bool(eh) and self.seen_hash(eh) and self.locate(rec.get("id")) == kind
+
+    def check_prefix(self, rec: Dict[str, Any]):
+        """Raise ValueError if another intent already owns this record's 12-char id prefix."""
+        collisions = self.prefix_collisions(rec["entropy_hash"]) if rec.get("entropy_hash") else []
+        if collisions:
+            raise ValueError(f"{rec.get('id')} collides with anchored hash prefix(es) {collisions}")
+
+
+_INDEX: Optional[VaultIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index() -> VaultIndex:
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            BASE.mkdir(parents=True, exist_ok=True)
+            _INDEX = VaultIndex(BASE)
+            import atexit
+            atexit.register(_INDEX.flush)
+        return _INDEX
@@ -7,8 +7,9 @@ import logging
 import hashlib
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
-from websockets.server import serve
 import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 # === Imports from sibling modules (absolute) ===
 from core.xyllenor.xap_handler import make_xap
@@ -17,13 +18,24 @@ from core.xyllenor.timevault_bridge import (
     load_xap,
     store_xap,
 )
+from core.xyllencore.merkle_log import get_log
+from core.xyllencore.vault_index import get_index
+from core.xyllencore.record_cache import get_cache
+from core.readiness import notify_ready
+from core import tracing
+from core.xyllenor import sampling_profiler
+from core.xyllenor.temporal_index import get_temporal_index
+from core.xyllenor.ledger import StripedLedger
 
 # --- Logging setup ---
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger("xyllenor")
 
 # --- Globals ---
-balances = {"alice": 0.0, "bob": 0.0}
+ledger = StripedLedger({"alice": 0.0, "bob": 0.0})
+# transfers from the WS loop apply here, off the event loop; disjoint accounts run in parallel
+transfer_pool = ThreadPoolExecutor(max_workers=int(os.environ.get("XYLL_TRANSFER_WORKERS", "8")),
+                                   thread_name_prefix="xyll-transfer")
 DATA_DIR = os.path.join(os.path.dirname(__file__), "../../data/timevault")
 os.makedirs(DATA_DIR, exist_ok=True)
 
@@ -32,8 +44,15 @@ app = Flask("engine")
 
 @app.route("/balance/<acct>")
 def balance(acct):
-    """Return current balance for a given account."""
-    return jsonify({"balance": balances.get(acct, 0.0)})
+    """Return current balance for a given account, or its balance replayed from the vault ?as_of=T."""
+    as_of = request.args.get("as_of")
+    if as_of is None:
+        return jsonify({"balance": ledger.balance(acct)})
+    try:
+        bal = get_temporal_index().balance_as_of(acct, as_of)
+    except ValueError:
+        return jsonify({"ok": False, "error": "bad_timestamp"}), 400
+    return jsonify({"balance": bal, "as_of": as_of})
 
 @app.route("/apply_intent", methods=["POST"])
 def apply_intent_http():
@@ -43,9 +62,11 @@ def apply_intent_http():
         if not intent or intent.get("type") != "transfer":
             return jsonify({"ok": False, "error": "invalid_intent"}), 400
 
-        apply_transfer(intent)
-        xap = make_xap(intent)
-        store_xap(xap)
+        ctx = tracing.extract(intent)
+        with tracing.span("apply_intent_http", parent=ctx, root=True, intent_id=intent.get("id")):
+            apply_transfer(intent)
+            xap = make_xap(intent)
+            store_xap(xap)
         return jsonify({"ok": True, "applied": intent["id"], "xap_id": xap["id"]})
     except Exception as e:
         log.exception("Error applying intent")
@@ -63,27 +84,77 @@ def memory_search():
                 results.append(rec)
     return jsonify(results)
 
+@app.route("/memory/range")
+def memory_range():
+    """Anchors with start <= intent timestamp < end, oldest first (ISO or epoch seconds)."""
+    try:
+        limit = int(request.args.get("limit", 500))
+        files = get_temporal_index().range(request.args.get("start"), request.args.get("end"), limit)
+    except ValueError:
+        return jsonify({"ok": False, "error": "bad_arguments"}), 400
+    results = [rec for rec in map(load_xap, files) if rec]
+    return jsonify(results)
+
+@app.route("/memory/proof/<anchor_id>")
+def memory_proof(anchor_id):
+    """O(log n) Merkle inclusion proof for an anchored record."""
+    proof = get_log().inclusion_proof(anchor_id)
+    if proof is None:
+        return jsonify({"ok": False, "error": "unknown_anchor"}), 404
+    return jsonify({"ok": True, **proof})
+
+@app.route("/admin/profile")
+def admin_profile():
+    """
+    Sample every engine thread for ?seconds=N (default 5) at ?interval_ms.
+    Returns collapsed stacks plus event-loop lag; ?format=collapsed gives
+    plain text for flamegraph.pl / speedscope.
+    """
+    token = os.environ.get("XYLL_ADMIN_TOKEN")
+    if token and request.headers.get("X-Xyll-Admin-Token") != token:
+        return jsonify({"ok": False, "error": "forbidden"}), 403
+    try:
+        seconds = float(request.args.get("seconds", 5))
+        interval = float(request.args.get("interval_ms", 5)) / 1000
+    except ValueError:
+        return jsonify({"ok": False, "error": "bad_arguments"}), 400
+    try:
+        result = sampling_profiler.profile(seconds, interval)
+    except sampling_profiler.Busy as e:
+        return jsonify({"ok": False, "error": str(e)}), 409
+    log.info(f"🔥 profiled {result['duration_s']}s: {result['samples']} samples, "
+             f"loop lag p99 {result['loop_lag_ms']['p99']} ms")
+    if request.args.get("format") == "collapsed":
+        return result["collapsed"] + "\n", 200, {"Content-Type": "text/plain; charset=utf-8"}
+    return jsonify({"ok": True, **result})
+
+@app.route("/admin/cache")
+def admin_cache():
+    """Hit/miss counters of the shared record cache."""
+    return jsonify(get_cache().stats())
+
 # === WebSocket handler ===
 async def ws_handler(websocket):
     """Handles live transfer intents from clients."""
     async for message in websocket:
         intent = json.loads(message)
+        ctx = tracing.extract(intent)  # off the intent before it is hashed
         log.info(f"⚡ received intent: {intent}")
         if intent["type"] == "transfer":
-            apply_transfer(intent)
-            xap = make_xap(intent)
-            store_xap(xap)
-            ack = {"ok": True, "type": "transfer", "from": intent["from"], "to": intent["to"], "amount": intent["amount"]}
-            await websocket.send(json.dumps(ack))
+            with tracing.span("ws_handler", parent=ctx, root=True, intent_id=intent.get("id")):
+                # copy_context keeps the trace span across the pool hop
+                await asyncio.get_running_loop().run_in_executor(
+                    transfer_pool, contextvars.copy_context().run, apply_transfer, intent)
+                xap = make_xap(intent)
+                store_xap(xap)
+                ack = {"ok": True, "type": "transfer", "from": intent["from"], "to": intent["to"], "amount": intent["amount"]}
+                await websocket.send(json.dumps(ack))
             log.info(f"✅ processed transfer {intent['from']} → {intent['to']}, {intent['amount']} xyls")
 
+@tracing.traced("apply_transfer")
 def apply_transfer(intent):
-    """Apply a transfer intent to balances."""
-    sender, receiver, amt = intent["from"], intent["to"], float(intent["amount"])
-    balances.setdefault(sender, 0.0)
-    balances.setdefault(receiver, 0.0)
-    balances[sender] -= amt
-    balances[receiver] += amt
+    """Apply a transfer intent to balances (safe from any thread)."""
+    ledger.transfer(intent["from"], intent["to"], float(intent["amount"]))
 
 # === Temporal Memory Decay ===
 def decay_old_xaps():
@@ -101,7 +172,9 @@ def decay_old_xaps():
             if not rec.get("permanent", False):
                 t = datetime.fromisoformat(rec["timestamp"])
                 if now - t > decay_window:
-                    os.remove(path)
+                    with get_index().removing(rec.get("id") or fn[:-len(".json")]):
+                        os.remove(path)
+                    get_cache().invalidate(path)
                     decayed += 1
         except Exception:
             continue
@@ -113,23 +186,41 @@ def decay_old_xaps():
 def decay_loop():
     """Run decay periodically in background."""
     while True:
-        decay_old_xaps()
+        try:
+            decay_old_xaps()
+            # pick up anchors written by other processes (executor, decay jobs)
+            index = get_index()
+            index.sync()
+            index.flush()
+        except Exception as e:
+            # e.g. ENOSPC writing the index: keep decaying, retry next round
+            log.warning(f"⚠️ decay pass failed: {e}")
         time.sleep(60)
 
 # === Startup ===
 async def main():
-    http_port, ws_port = 8766, 8765
+    # server-only dependencies; importing this module for its handlers doesn't need them
+    from werkzeug.serving import make_server
+    from websockets.server import serve
+
+    tracing.set_service("engine")
+    http_port = int(os.environ.get("XYLL_ENGINE_HTTP_PORT", "8766"))
+    ws_port = int(os.environ.get("XYLL_ENGINE_WS_PORT", "8765"))
     log.info(f"HTTP read API → http://127.0.0.1:{http_port}")
     log.info(f"WS server → ws://127.0.0.1:{ws_port}")
 
+    sampling_profiler.attach_loop(asyncio.get_running_loop())
+
     # Background thread for decay
     threading.Thread(target=decay_loop, daemon=True).start()
 
     # Start WebSocket server
     async with serve(ws_handler, "127.0.0.1", ws_port):
         log.info(f"✅ WebSocket server active on ws://127.0.0.1:{ws_port}")
-        # Start Flask in a thread
-        threading.Thread(target=lambda: app.run(host="127.0.0.1", port=http_port, use_reloader=False), daemon=True).start()
+        # Bind HTTP before reporting ready, then serve Flask in a thread
+        http = make_server("127.0.0.1", http_port, app, threaded=True)
+        threading.Thread(target=http.serve_forever, daemon=True).start()
+        notify_ready("engine", ws_port=ws_port, http_port=http_port)
         # Keep running forever
         while True:
             await asyncio.sleep(10)
@@ -0,0 +1,136 @@
+# ~/work/xyllidium/core/xyllenor/ledger.py
+"""
+Balance ledger with striped per-account locks.
+
+- Accounts hash (crc32) onto STRIPES shards, each a dict guarded by its
+  own lock; a shard's dict is only touched under its lock
+- A transfer takes the one or two stripe locks of its parties in
+  ascending stripe order, so concurrent transfers never deadlock and
+  transfers between disjoint stripes run in parallel
+- snapshot() takes every stripe (in order) for a consistent view
+
+Stress check (balances must be conserved and match a sequential replay);
+a smaller, high-contention run is part of the test suite (core/tests,
+`python -m pytest`):
+
+  python -m core.xyllenor.ledger --threads 16 --transfers 200000 --accounts 500
+"""
+import zlib, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Iterable, Tuple
+
+STRIPES = 64
+
+
+class StripedLedger:
+    def __init__(self, initial: Optional[Dict[str, float]] = None, stripes: int = STRIPES):
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._shards: list[Dict[str, float]] = [{} for _ in range(stripes)]
+        for acct, bal in (initial or {}).items():
+            self._shards[self._stripe(acct)][acct] = float(bal)
+
+    def _stripe(self, acct: str) -> int:
+        return zlib.crc32(acct.encode()) % self.stripes
+
+    def transfer(self, sender: str, receiver: str, amount: float):
+        """Move `amount` from sender to receiver atomically with respect to both accounts."""
+        amount = float(amount)
+        s, r = self._stripe(sender), self._stripe(receiver)
+        first, second = (s, r) if s <= r else (r, s)
+        with self._locks[first]:
+            if second != first:
+                self._locks[second].acquire()
+            try:
+                src, dst = self._shards[s], self._shards[r]
+                src[sender] = src.get(sender, 0.0) - amount
+                dst[receiver] = dst.get(receiver, 0.0) + amount
+            finally:
+                if second != first:
+                    self._locks[second].release()
+
+    def balance(self, acct: str) -> float:
+        i = self._stripe(acct)
+        with self._locks[i]:
+            return self._shards[i].get(acct, 0.0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Consistent copy of every balance (blocks transfers while copying)."""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            out: Dict[str, float] = {}
+            for shard in self._shards:
+                out.update(shard)
+            return out
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def total(self) -> float:
+        return sum(self.snapshot().values())
+
+
+def apply_parallel(ledger: StripedLedger, transfers: Iterable[Tuple[str, str, float]],
+                   pool: ThreadPoolExecutor, chunk: int = 1024):
+    """Apply (sender, receiver, amount) transfers on `pool`; returns once all are applied."""
+    def run(batch):
+        for s, r, a in batch:
+            ledger.transfer(s, r, a)
+
+    batch, futures = [], []
+    for t in transfers:
+        batch.append(t)
+        if len(batch) >= chunk:
+            futures.append(pool.submit(run, batch))
+            batch = []
+    if batch:
+        futures.append(pool.submit(run, batch))
+    for f in futures:
+        f.result()
+
+
+def _stress(threads: int, n: int, accounts: int, stripes: int, seed: int) -> bool:
+    import time, random
+    rng = random.Random(seed)
+    names = [f"acct-{i}" for i in range(accounts)]
+    initial = {a: 1000.0 for a in names}
+    # integral amounts: float sums are exact, so any lost update shows up as a mismatch
+    transfers = [(*rng.sample(names, 2), float(rng.randint(1, 50))) for _ in range(n)]
+
+    expected = dict(initial)
+    for s, r, a in transfers:
+        expected[s] -= a
+        expected[r] += a
+
+    ledger = StripedLedger(initial, stripes=stripes)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        apply_parallel(ledger, transfers, pool, chunk=max(1, n // (threads * 8)))
+    elapsed = time.perf_counter() - t0
+
+    got = ledger.snapshot()
+    conserved = sum(got.values()) == sum(initial.values())
+    wrong = [a for a in names if got.get(a) != expected[a]]
+    print(f"🔒 {n} transfers over {accounts} accounts on {threads} threads / {stripes} stripes "
+          f"in {elapsed:.2f}s ({n / elapsed:,.0f}/s)")
+    print(f"   total conserved: {'✅' if conserved else '❌'}  "
+          f"per-account match: {'✅' if not wrong else f'❌ {len(wrong)} differ'}")
+    return conserved and not wrong
+
+
+def main():
+    import sys, argparse
+    ap = argparse.ArgumentParser(description="Stress the striped ledger and check conservation.")
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--transfers", type=int, default=200_000)
+    ap.add_argument("--accounts", type=int, default=500)
+    ap.add_argument("--stripes", type=int, default=STRIPES)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+    ok = _stress(args.threads, args.transfers, args.accounts, args.stripes, args.seed)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
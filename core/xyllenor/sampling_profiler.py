@@ -0,0 +1,118 @@
+# ~/work/xyllidium/core/xyllenor/sampling_profiler.py
+"""
+On-demand sampling profiler for the running engine.
+
+- A daemon thread snapshots every thread's stack with
+  sys._current_frames() every `interval` seconds and counts collapsed
+  stacks ("thread;file:func;file:func N"), the input format of
+  flamegraph.pl / speedscope
+- While sampling, a probe coroutine on the engine's event loop sleeps for
+  `interval` and records how late it wakes up (event-loop lag)
+- Nothing runs between profiles; one profile at a time per process
+"""
+import os, sys, time, asyncio, threading
+from collections import Counter
+from typing import Dict, Any, List, Optional
+
+MAX_SECONDS = 60.0
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_busy = threading.Lock()
+
+
+class Busy(RuntimeError):
+    pass
+
+
+def attach_loop(loop: asyncio.AbstractEventLoop):
+    """Register the event loop whose lag should be measured."""
+    global _loop
+    _loop = loop
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}".replace(";", ":").replace(" ", "_")
+
+
+def _collapse(frame, thread_name: str) -> str:
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.append(thread_name.replace(" ", "_"))
+    return ";".join(reversed(stack))
+
+
+def _percentile(xs: List[float], q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+async def _lag_probe(interval: float, stop: threading.Event, out: List[float]):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        out.append(max(0.0, time.perf_counter() - t0 - interval))
+
+
+def profile(seconds: float, interval: float = 0.005) -> Dict[str, Any]:
+    """Sample all threads for `seconds`; blocks the caller. Raises Busy if already running."""
+    seconds = min(max(seconds, 0.1), MAX_SECONDS)
+    interval = max(interval, 0.001)
+    if not _busy.acquire(blocking=False):
+        raise Busy("a profile is already running")
+    try:
+        stacks: Counter = Counter()
+        lag: List[float] = []
+        stop = threading.Event()
+        skip = {threading.get_ident()}
+        samples = 0
+
+        probe = None
+        if _loop is not None and _loop.is_running():
+            probe = asyncio.run_coroutine_threadsafe(_lag_probe(interval, stop, lag), _loop)
+
+        def sampler():
+            nonlocal samples
+            me = threading.get_ident()
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == me or ident in skip:
+                        continue
+                    stacks[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+                samples += 1
+                time.sleep(interval)
+
+        t = threading.Thread(target=sampler, name="xyll-profiler", daemon=True)
+        started = time.perf_counter()
+        t.start()
+        t.join()
+        elapsed = time.perf_counter() - started
+        stop.set()
+        if probe is not None:
+            try:
+                probe.result(timeout=1.0)
+            except Exception:
+                probe.cancel()
+
+        return {
+            "duration_s": round(elapsed, 3),
+            "interval_ms": interval * 1000,
+            "samples": samples,
+            "collapsed": "\n".join(f"{s} {n}" for s, n in stacks.most_common()),
+            "loop_lag_ms": {
+                "measured": probe is not None,
+                "probes": len(lag),
+                "mean": round(sum(lag) / len(lag) * 1000, 3) if lag else 0.0,
+                "p50": round(_percentile(lag, 0.50) * 1000, 3),
+                "p99": round(_percentile(lag, 0.99) * 1000, 3),
+                "max": round(max(lag, default=0.0) * 1000, 3),
+            },
+        }
+    finally:
+        _busy.release()
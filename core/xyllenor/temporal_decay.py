@@ -3,6 +3,9 @@ import os, json, time
 from datetime import datetime, timezone, timedelta
 from typing import Tuple, Dict, Any
 
+from core.xyllencore.record_cache import get_cache
+from core.xyllencore.vault_index import get_index
+
 VAULT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "timevault")
 
 # Decay config (v4.5)
@@ -67,6 +70,7 @@ def reinforce_record(xap_id: str) -> bool:
     rec["timestamp"] = _now().isoformat()
 
     _save(path, rec)
+    get_cache().invalidate(path)
     return True
 
 def run_decay_once(vault_dir: str = VAULT_DIR) -> int:
@@ -85,12 +89,16 @@ def run_decay_once(vault_dir: str = VAULT_DIR) -> int:
             res = rec.get("resonance", {})
             window_h = _effective_window_hours(res)
             if (now - ts) > timedelta(hours=window_h):
-                os.remove(path)
+                with get_index().removing(os.path.basename(path)[:-len(".json")]):
+                    os.remove(path)
+                get_cache().invalidate(path)
                 deleted += 1
         except Exception:
             # If a file is corrupt, attempt to remove it to avoid poisoning the vault.
             try:
-                os.remove(path)
+                with get_index().removing(os.path.basename(path)[:-len(".json")]):
+                    os.remove(path)
+                get_cache().invalidate(path)
                 deleted += 1
             except Exception:
                 pass
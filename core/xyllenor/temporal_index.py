@@ -0,0 +1,165 @@
+# ~/work/xyllidium/core/xyllenor/temporal_index.py
+"""
+Time-ordered index over TimeVault anchors with balance checkpoints.
+
+Built on the columnar export (vault_columns): live anchors are sorted by
+their intent timestamp (`ts`), and every CHECKPOINT_EVERY transfer XAPs the
+running balance of every account is stored. A balance as of T is the
+nearest checkpoint at or before T plus a vectorized replay of at most
+CHECKPOINT_EVERY - 1 transfers.
+
+refresh() keeps the longest unchanged prefix of the ordering, so anchors
+arriving in time order only extend the tail; checkpoints are recomputed
+from the first position that changed. Between full checks (at most every
+FULL_CHECK_S) it is gated on the vault directory's mtime, which catches
+created and deleted anchors with one stat; the full check is a ColumnStore
+sync, which compares every file's mtime and size and so also sees records
+rewritten in place.
+"""
+import os
+import time
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from core.xyllenor.vault_columns import ColumnStore, KINDS, get_columns, as_us
+
+CHECKPOINT_EVERY = 256
+FULL_CHECK_S = 5.0
+
+_XAP = KINDS.index("xap")
+
+
+def _common_prefix(a: np.ndarray, b: np.ndarray) -> int:
+    n = min(len(a), len(b))
+    diff = np.flatnonzero(a[:n] != b[:n])
+    return int(diff[0]) if len(diff) else n
+
+
+class TemporalIndex:
+    def __init__(self, store: Optional[ColumnStore] = None, every: int = CHECKPOINT_EVERY):
+        self.store = store
+        self.every = every
+        self._lock = threading.RLock()
+        self._version: Tuple[int, int] = (-1, -1)
+        self._dir_mtime = -1
+        self._checked_at = float("-inf")   # monotonic time of the last full sync
+        self.order = np.zeros(0, dtype=np.int64)      # all live anchors, by ts
+        self.times = np.zeros(0, dtype=np.int64)
+        self.tx_order = np.zeros(0, dtype=np.int64)   # transfer XAPs, by ts
+        self.tx_times = np.zeros(0, dtype=np.int64)
+        self.checkpoints = np.zeros((1, 0))           # row i: balances after i*every transfers
+
+    def _store(self) -> ColumnStore:
+        if self.store is None:
+            self.store = get_columns(sync=False)
+        return self.store
+
+    def refresh(self) -> "TemporalIndex":
+        """Sync the columns and bring the orderings and checkpoints up to date."""
+        with self._lock:
+            store = self._store()
+            mtime, now = os.stat(store.base).st_mtime_ns, time.monotonic()
+            if mtime == self._dir_mtime and now - self._checked_at < FULL_CHECK_S:
+                return self
+            # stamped before the scan: later writes re-trigger
+            self._dir_mtime, self._checked_at = mtime, now
+            store.sync()
+            live = store.column("live")
+            version = (store.rows, int(np.count_nonzero(live)))
+            if version == self._version:
+                return self
+            ts = np.asarray(store.column("ts"))
+            rows = np.flatnonzero(live)
+            self.order = rows[np.argsort(ts[rows], kind="stable")]
+            self.times = ts[self.order]
+
+            transfer = store.lookup("type", "transfer")
+            is_tx = (np.asarray(store.column("kind"))[self.order] == _XAP) & \
+                    (np.asarray(store.column("type"))[self.order] == transfer)
+            tx_order = self.order[is_tx]
+            keep = _common_prefix(self.tx_order, tx_order)
+            self.tx_order, self.tx_times = tx_order, ts[tx_order]
+            self._rebuild_checkpoints(keep // self.every, len(store.dictionary("account")))
+            self._version = version
+            return self
+
+    def _deltas(self, lo: int, hi: int, n_accounts: int) -> np.ndarray:
+        """Net balance change of every account over transfers [lo, hi) in time order."""
+        rows = self.tx_order[lo:hi]
+        store = self._store()
+        amt = np.asarray(store.column("amount"))[rows]
+        src = np.asarray(store.column("src"))[rows]
+        dst = np.asarray(store.column("dst"))[rows]
+        out = np.zeros(n_accounts)
+        ok = src >= 0
+        np.subtract.at(out, src[ok], amt[ok])
+        ok = dst >= 0
+        np.add.at(out, dst[ok], amt[ok])
+        return out
+
+    def _rebuild_checkpoints(self, valid: int, n_accounts: int):
+        n_ckpt = len(self.tx_order) // self.every + 1
+        ck = np.zeros((n_ckpt, n_accounts))
+        valid = min(valid, n_ckpt - 1, len(self.checkpoints) - 1)
+        w = self.checkpoints.shape[1]
+        ck[:valid + 1, :w] = self.checkpoints[:valid + 1]  # new accounts start at 0
+        for i in range(valid, n_ckpt - 1):
+            ck[i + 1] = ck[i] + self._deltas(i * self.every, (i + 1) * self.every, n_accounts)
+        self.checkpoints = ck
+
+    # ---- queries ----
+
+    def range(self, start=None, end=None, limit: Optional[int] = None) -> List[str]:
+        """Vault filenames of live anchors with start <= ts < end, oldest first."""
+        with self._lock:
+            lo = 0 if start is None else int(np.searchsorted(self.times, as_us(start), "left"))
+            hi = len(self.times) if end is None else int(np.searchsorted(self.times, as_us(end), "left"))
+            rows = self.order[lo:hi if limit is None else min(hi, lo + limit)]
+            return self._store().filenames(rows.tolist())
+
+    def balances_as_of(self, as_of=None) -> Dict[str, float]:
+        """Every account's balance after all transfers with ts <= as_of."""
+        with self._lock:
+            accounts = self._store().dictionary("account")
+            n = len(self.tx_times) if as_of is None else \
+                int(np.searchsorted(self.tx_times, as_us(as_of), "right"))
+            c = n // self.every
+            bal = self.checkpoints[c].copy()
+            bal += self._deltas(c * self.every, n, len(bal))
+            return {acct: float(b) for acct, b in zip(accounts, bal)}
+
+    def balance_as_of(self, acct: str, as_of=None) -> float:
+        with self._lock:
+            code = self._store().lookup("account", acct)
+            if code < 0:
+                return 0.0
+            n = len(self.tx_times) if as_of is None else \
+                int(np.searchsorted(self.tx_times, as_us(as_of), "right"))
+            c = n // self.every
+            bal = self.checkpoints[c, code]
+            rows = self.tx_order[c * self.every:n]
+            if len(rows):
+                store = self._store()
+                amt = np.asarray(store.column("amount"))[rows]
+                bal += amt[np.asarray(store.column("dst"))[rows] == code].sum()
+                bal -= amt[np.asarray(store.column("src"))[rows] == code].sum()
+            return float(bal)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"anchors": len(self.order), "transfers": len(self.tx_order),
+                "checkpoints": len(self.checkpoints), "every": self.every}
+
+
+_INDEX: Optional[TemporalIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_temporal_index() -> TemporalIndex:
+    """Process-wide index, refreshed on each call (usually one stat when nothing changed)."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = TemporalIndex()
+    return _INDEX.refresh()
@@ -4,6 +4,11 @@ import json
 import logging
 from datetime import datetime
 
+from core import tracing
+from core.xyllencore.merkle_log import get_log
+from core.xyllencore.record_cache import get_cache
+from core.xyllencore.vault_index import get_index
+
 log = logging.getLogger("timevault")
 
 # Base vault directory
@@ -24,13 +29,13 @@ def load_xap(filename):
     """Load a single XAP or CAP file from TimeVault."""
     path = os.path.join(DATA_DIR, filename)
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return get_cache().load(path)
     except Exception as e:
         log.warning(f"⚠️ Failed to load {filename}: {e}")
         return None
 
 
+@tracing.traced("store_xap")
 def store_xap(xap):
     """Store a new XAP record in the TimeVault."""
     if not isinstance(xap, dict):
@@ -39,9 +44,18 @@ def store_xap(xap):
     xap_id = xap.get("id") or f"XAP-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
     path = os.path.join(DATA_DIR, f"{xap_id}.json")
 
+    index = get_index()
+    if index.anchored(xap, "xap"):
+        # make_xap already wrote it (or the intent was replayed)
+        log.info(f"♻️ XAP already anchored → {path}")
+        return
+    index.check_prefix(xap)
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(xap, f, indent=2)
+        with index.writing(xap, "xap"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(xap, f, indent=2)
+        get_cache().invalidate(path)
+        get_log().append(xap)
         log.info(f"📦 Stored XAP snapshot → {path}")
     except Exception as e:
         log.error(f"❌ Failed to store XAP: {e}")
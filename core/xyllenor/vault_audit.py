@@ -0,0 +1,159 @@
+# ~/work/xyllidium/core/xyllenor/vault_audit.py
+"""
+Bulk TimeVault audit: recompute entropy hashes and verify Ed25519 signatures.
+
+  python -m core.xyllenor.vault_audit            # only records new since last audit
+  python -m core.xyllenor.vault_audit --full     # everything
+"""
+import os, sys, json, time, hashlib, argparse, logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple, Optional
+
+from core.xyllenor.timevault_bridge import DATA_DIR
+
+log = logging.getLogger("vault_audit")
+
+WATERMARK_FILE = ".audit_watermark"
+CHUNK = 64
+
+
+def _payload(intent: Dict[str, Any]) -> bytes:
+    # must match make_xap / make_anchor_payload exactly
+    return json.dumps(intent, sort_keys=True).encode()
+
+
+def verify_record(rec: Dict[str, Any]) -> Optional[str]:
+    """Returns None if the record checks out, else a short failure reason."""
+    rid = rec.get("id", "")
+    intent = rec.get("intent")
+    if intent is None:
+        return "missing intent"
+    digest = hashlib.sha256(_payload(intent)).hexdigest()
+
+    if rid.startswith("CAP-"):
+        if rec.get("entropy_hash") != digest:
+            return "entropy hash mismatch"
+        if rid != f"CAP-{digest[:12]}":
+            return "id does not match entropy hash"
+        return None
+
+    entropy = digest.upper()
+    if rec.get("entropy_hash") != f"XYLL-ENTR-{entropy}":
+        return "entropy hash mismatch"
+    if rid != f"XAP-{entropy[:12]}":
+        return "id does not match entropy hash"
+    try:
+        from nacl.signing import VerifyKey
+        from nacl.exceptions import BadSignatureError
+        pub = rec["public_key"].split("XYLL-PUB-", 1)[1]
+        sig = rec["signature"].split("XYLL-SIG-", 1)[1]
+        VerifyKey(bytes.fromhex(pub)).verify(_payload(intent), bytes.fromhex(sig))
+    except BadSignatureError:
+        return "bad signature"
+    except (KeyError, IndexError, ValueError) as e:
+        return f"malformed signature fields: {e}"
+    return None
+
+
+def _verify_files(args: Tuple[str, List[str]]) -> List[Tuple[str, Optional[str]]]:
+    """Worker: verify a chunk of files; returns (filename, failure-or-None)."""
+    vault, names = args
+    out = []
+    for fn in names:
+        try:
+            with open(os.path.join(vault, fn), "r", encoding="utf-8") as f:
+                out.append((fn, verify_record(json.load(f))))
+        except Exception as e:
+            out.append((fn, f"unreadable: {e}"))
+    return out
+
+
+def _auditable(fn: str) -> bool:
+    # stubs carry no intent to re-hash
+    return fn.endswith(".json") and not fn.endswith(".stub.json") and fn.startswith(("XAP-", "CAP-"))
+
+
+def _load_watermark(vault: str) -> Dict[str, Any]:
+    try:
+        with open(os.path.join(vault, WATERMARK_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"mtime_ns": 0, "at_mark": [], "failed": []}
+
+
+def _save_watermark(vault: str, wm: Dict[str, Any]):
+    path = os.path.join(vault, WATERMARK_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(wm, f)
+    os.replace(tmp, path)
+
+
+def audit_vault(vault: str = DATA_DIR, full: bool = False, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Verify every record modified after the watermark (all of them if `full`),
+    plus anything that failed last time. Advances the watermark on completion.
+    """
+    wm = {"mtime_ns": 0, "at_mark": [], "failed": []} if full else _load_watermark(vault)
+    mark, at_mark, retry = wm["mtime_ns"], set(wm["at_mark"]), set(wm["failed"])
+
+    todo: List[str] = []
+    mtimes: Dict[str, int] = {}
+    for entry in os.scandir(vault):
+        if not _auditable(entry.name):
+            continue
+        m = entry.stat().st_mtime_ns
+        mtimes[entry.name] = m
+        if m > mark or (m == mark and entry.name not in at_mark) or entry.name in retry:
+            todo.append(entry.name)
+    todo.sort()
+
+    started = time.perf_counter()
+    failures: List[Tuple[str, str]] = []
+    chunks = [(vault, todo[i:i + CHUNK]) for i in range(0, len(todo), CHUNK)]
+    if len(chunks) <= 1:
+        results = map(_verify_files, chunks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_verify_files, chunks)
+    for chunk in results:
+        failures.extend((fn, err) for fn, err in chunk if err)
+    if len(chunks) > 1:
+        pool.shutdown()
+    elapsed = time.perf_counter() - started
+
+    new_mark = max([mark] + [mtimes[fn] for fn in todo])
+    _save_watermark(vault, {
+        "mtime_ns": new_mark,
+        "at_mark": sorted(fn for fn, m in mtimes.items() if m == new_mark),
+        "failed": sorted(fn for fn, _ in failures),
+        "audited_at": time.time(),
+    })
+
+    return {
+        "checked": len(todo),
+        "skipped": len(mtimes) - len(todo),
+        "failed": len(failures),
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round(len(todo) / elapsed, 1) if elapsed > 0 else None,
+        "failures": [{"file": fn, "error": err} for fn, err in failures],
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    ap = argparse.ArgumentParser(description="Verify TimeVault entropy hashes and signatures.")
+    ap.add_argument("--vault", default=DATA_DIR)
+    ap.add_argument("--full", action="store_true", help="ignore the watermark and audit everything")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    report = audit_vault(args.vault, full=args.full, workers=args.workers)
+    log.info(f"🔏 audited {report['checked']} record(s) in {report['elapsed_s']}s "
+             f"({report['records_per_s']}/s), {report['skipped']} unchanged, {report['failed']} failed")
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
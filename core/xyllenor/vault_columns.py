@@ -0,0 +1,428 @@
+# ~/work/xyllidium/core/xyllenor/vault_columns.py
+"""
+Columnar export of the TimeVault for analytics.
+
+- One raw little-endian column file per field under data/timevault/.columns/,
+  memory-mapped on read; one row per XAP, CAP or stub
+- Accounts, units and intent types are dictionary-encoded (codes into
+  lists kept in meta.json)
+- sync() is incremental: one directory scan, only new or rewritten files
+  are parsed. Rows of deleted or rewritten files are tombstoned
+  (live = 0), never moved
+- Queries are vectorized masks + bincount over the mapped columns
+
+  cols = get_columns()
+  cols.select(kind="xap", start="2025-11-11").sum("amount", by="src")
+  cols.select(unit="xyls").sum("amount", by=("src", "hour"))
+  cols.select().top("src", n=5)
+
+  python -m core.xyllenor.vault_columns [--rebuild] [--top N] [--hourly]
+"""
+import os, json, fcntl, threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.xyllencore.vault_index import BASE, normalize_hash
+
+COLUMN_DIR = ".columns"
+META_FILE = "meta.json"
+COLUMNS_VERSION = 2     # 2: files carry [row, mtime_ns, size]
+
+COLUMNS = {
+    "ts": "<i8",           # intent time, µs since epoch (UTC); stubs: decay time
+    "anchored": "<i8",     # record timestamp (decay time for stubs), µs
+    "kind": "u1",          # KINDS
+    "type": "<i2",         # code into dicts["type"]
+    "src": "<i4",          # code into dicts["account"]
+    "dst": "<i4",          # code into dicts["account"]
+    "unit": "<i2",         # code into dicts["unit"]
+    "amount": "<f8",
+    "permanent": "u1",
+    "live": "u1",          # 0 once the file is deleted or rewritten
+    "hash64": "<u8",       # first 64 bits of the entropy hash
+}
+KINDS = ("xap", "cap", "stub")
+_DICT_OF = {"src": "account", "dst": "account", "unit": "unit", "type": "type"}
+_BUCKETS = {"minute": 60, "hour": 3600, "day": 86400}
+
+_US = 1_000_000
+_MISSING_TS = -1
+_I64_MAX = np.iinfo(np.int64).max
+
+
+def _kind_of(fn: str) -> Optional[str]:
+    if fn.endswith(".stub.json"):
+        return "stub"
+    if fn.endswith(".json") and fn.startswith("XAP-"):
+        return "xap"
+    if fn.endswith(".json") and fn.startswith("CAP-"):
+        return "cap"
+    return None
+
+
+def _to_us(iso: Optional[str]) -> int:
+    if not iso:
+        return _MISSING_TS
+    try:
+        dt = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    except ValueError:
+        return _MISSING_TS
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)  # XAPs use naive UTC
+    return int(dt.timestamp() * _US)
+
+
+def as_us(t: Union[None, int, float, str, datetime]) -> Optional[int]:
+    """Query time -> µs since epoch. Accepts ISO strings (naive = UTC),
+    datetimes and epoch seconds (numbers or numeric strings); raises
+    ValueError on anything else, including out-of-range times."""
+    if t is None:
+        return None
+    try:
+        if isinstance(t, str):
+            try:
+                us = int(float(t) * _US)
+            except ValueError:
+                t = datetime.fromisoformat(t.replace("Z", "+00:00"))
+        if isinstance(t, datetime):
+            if t.tzinfo is None:
+                t = t.replace(tzinfo=timezone.utc)
+            us = int(t.timestamp() * _US)
+        elif not isinstance(t, str):
+            us = int(t * _US)
+    except OverflowError:  # inf
+        us = _I64_MAX + 1
+    if not -_I64_MAX <= us <= _I64_MAX:  # columns are int64; 1e300 would overflow numpy
+        raise ValueError(f"time out of range: {t!r}")
+    return us
+
+
+class ColumnStore:
+    def __init__(self, base: Path = BASE):
+        self.base = Path(base)
+        self.dir = self.base / COLUMN_DIR
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.dir / META_FILE
+        self._lock = threading.RLock()
+        self._maps: Dict[str, np.ndarray] = {}
+        self._mapped_rows = -1
+        self.meta = self._load_meta()
+        self._names: List[Optional[str]] = []    # row -> filename (None once tombstoned)
+        self._names_key: Tuple[int, int] = (-1, -1)
+        self._index_names()
+
+    # ---- persistence ----
+
+    def _empty_meta(self) -> Dict[str, Any]:
+        return {"version": COLUMNS_VERSION, "rows": 0,
+                "dicts": {"account": [], "unit": [], "type": []},
+                "files": {}}
+
+    def _load_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            if meta.get("version") == COLUMNS_VERSION:
+                return meta
+        except (OSError, ValueError):
+            pass
+        return self._empty_meta()
+
+    def _save_meta(self):
+        tmp = self.meta_path.with_name(META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.meta_path)
+
+    def _index_names(self):
+        """Rebuild the row -> filename array if meta changed under us."""
+        key = (self.meta["rows"], len(self.meta["files"]))
+        if key == self._names_key:
+            return
+        names: List[Optional[str]] = [None] * self.meta["rows"]
+        for fn, (row, *_) in self.meta["files"].items():
+            names[row] = fn
+        self._names, self._names_key = names, key
+
+    def _col_path(self, name: str) -> Path:
+        return self.dir / f"{name}.col"
+
+    def rebuild(self) -> int:
+        with self._lock:
+            for name in COLUMNS:
+                self._col_path(name).unlink(missing_ok=True)
+            self.meta = self._empty_meta()
+            self._save_meta()  # sync() reloads meta from disk
+            self._maps, self._mapped_rows = {}, -1
+            return self.sync()
+
+    # ---- incremental export ----
+
+    def _code(self, dict_name: str, value: Any, index: Dict[str, int]) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(self.meta["dicts"][dict_name])
+            self.meta["dicts"][dict_name].append(value)
+        return code
+
+    def _row(self, rec: Dict[str, Any], kind: str, idx: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+        intent = rec.get("hint") if kind == "stub" else rec.get("intent")
+        intent = intent or {}
+        anchored = _to_us(rec.get("decayed_at") if kind == "stub" else rec.get("timestamp"))
+        ts = _to_us(intent.get("timestamp"))
+        eh = rec.get("entropy_hash")
+        try:
+            amount = float(intent.get("amount") or 0.0)
+        except (TypeError, ValueError):
+            amount = 0.0
+        return {
+            "ts": ts if ts != _MISSING_TS else anchored,
+            "anchored": anchored,
+            "kind": KINDS.index(kind),
+            "type": self._code("type", intent.get("type"), idx["type"]),
+            "src": self._code("account", intent.get("from"), idx["account"]),
+            "dst": self._code("account", intent.get("to"), idx["account"]),
+            "unit": self._code("unit", intent.get("unit"), idx["unit"]),
+            "amount": amount,
+            "permanent": 1 if rec.get("permanent") else 0,
+            "live": 1,
+            "hash64": int(normalize_hash(eh)[:16], 16) if eh else 0,
+        }
+
+    def sync(self) -> int:
+        """
+        Bring the columns up to date with the vault: append rows for new or
+        rewritten files, tombstone rows whose file is gone. Returns rows appended.
+        """
+        with self._lock, open(self.meta_path.with_name(".lock"), "w") as lk:
+            fcntl.flock(lk, fcntl.LOCK_EX)
+            try:
+                self.meta = self._load_meta()  # another process may have synced
+                self._index_names()
+                files: Dict[str, List[int]] = self.meta["files"]
+                rows = self.meta["rows"]
+
+                # a rewrite shows as a new mtime or size (size covers coarse mtimes)
+                present: Dict[str, List[int]] = {}
+                for entry in os.scandir(self.base):
+                    if _kind_of(entry.name):
+                        st = entry.stat()
+                        present[entry.name] = [st.st_mtime_ns, st.st_size]
+
+                dead = [files[fn][0] for fn in files if fn not in present or files[fn][1:] != present[fn]]
+                todo = sorted(fn for fn, m in present.items() if fn not in files or files[fn][1:] != m)
+                if not dead and not todo:
+                    return 0
+
+                idx = {d: {v: i for i, v in enumerate(vals)} for d, vals in self.meta["dicts"].items()}
+                new_rows: List[Dict[str, Any]] = []
+                for fn in todo:
+                    try:
+                        with open(self.base / fn) as f:
+                            rec = json.load(f)
+                    except (OSError, ValueError):
+                        files.pop(fn, None)
+                        continue
+                    new_rows.append(self._row(rec, _kind_of(fn), idx))
+                    files[fn] = [rows + len(new_rows) - 1, *present[fn]]
+                for fn in [fn for fn in files if fn not in present]:
+                    del files[fn]
+
+                for name, dt in COLUMNS.items():
+                    path = self._col_path(name)
+                    with open(path, "ab") as f:
+                        f.truncate(rows * np.dtype(dt).itemsize)  # drop a torn append
+                        f.write(np.array([r[name] for r in new_rows], dtype=dt).tobytes())
+                if dead:
+                    live = np.memmap(self._col_path("live"), dtype=COLUMNS["live"], mode="r+",
+                                     shape=(rows + len(new_rows),))
+                    live[np.array(dead, dtype=np.int64)] = 0
+                    live.flush()
+                    del live
+
+                self.meta["rows"] = rows + len(new_rows)
+                self._save_meta()
+                for row in dead:
+                    self._names[row] = None
+                self._names.extend([None] * len(new_rows))
+                for fn in todo:
+                    if fn in files:
+                        self._names[files[fn][0]] = fn
+                self._names_key = (self.meta["rows"], len(files))
+                self._maps, self._mapped_rows = {}, -1
+                return len(new_rows)
+            finally:
+                fcntl.flock(lk, fcntl.LOCK_UN)
+
+    # ---- access ----
+
+    @property
+    def rows(self) -> int:
+        return self.meta["rows"]
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memory map of one column (all rows, including tombstoned)."""
+        with self._lock:
+            if self._mapped_rows != self.rows:
+                self._maps, self._mapped_rows = {}, self.rows
+            arr = self._maps.get(name)
+            if arr is None:
+                if self.rows == 0:
+                    arr = np.zeros(0, dtype=COLUMNS[name])
+                else:
+                    arr = np.memmap(self._col_path(name), dtype=COLUMNS[name], mode="r", shape=(self.rows,))
+                self._maps[name] = arr
+            return arr
+
+    def dictionary(self, name: str) -> List[str]:
+        return self.meta["dicts"][name]
+
+    def filenames(self, rows: Sequence[int]) -> List[str]:
+        """Vault filenames of `rows`, skipping tombstoned ones."""
+        names = self._names
+        return [fn for fn in (names[r] for r in rows) if fn is not None]
+
+    def lookup(self, dict_name: str, value: str) -> int:
+        try:
+            return self.meta["dicts"][dict_name].index(value)
+        except ValueError:
+            return -2  # matches nothing (missing values are -1)
+
+    def select(self, kind: Union[None, str, Sequence[str]] = None, src: Optional[str] = None,
+               dst: Optional[str] = None, account: Optional[str] = None, unit: Optional[str] = None,
+               type: Optional[str] = None, start=None, end=None, live: Optional[bool] = True,
+               permanent: Optional[bool] = None) -> "Selection":
+        """
+        Vectorized row filter. `account` matches either side; `start` /
+        `end` (ISO string, datetime or epoch seconds) bound `ts`, end-exclusive.
+        `live=None` includes tombstoned rows.
+        """
+        mask = np.ones(self.rows, dtype=bool)
+        if live is not None:
+            mask &= self.column("live") == (1 if live else 0)
+        if kind is not None:
+            kinds = [kind] if isinstance(kind, str) else list(kind)
+            mask &= np.isin(self.column("kind"), [KINDS.index(k) for k in kinds])
+        for col, val in (("src", src), ("dst", dst), ("unit", unit), ("type", type)):
+            if val is not None:
+                mask &= self.column(col) == self.lookup(_DICT_OF[col], val)
+        if account is not None:
+            code = self.lookup("account", account)
+            mask &= (self.column("src") == code) | (self.column("dst") == code)
+        if permanent is not None:
+            mask &= self.column("permanent") == (1 if permanent else 0)
+        lo, hi = as_us(start), as_us(end)
+        if lo is not None:
+            mask &= self.column("ts") >= lo
+        if hi is not None:
+            mask &= self.column("ts") < hi
+        return Selection(self, mask)
+
+
+class Selection:
+    """A boolean mask over a ColumnStore; aggregations run only over selected rows."""
+
+    def __init__(self, store: ColumnStore, mask: np.ndarray):
+        self.store = store
+        self.mask = mask
+        self._rows = np.flatnonzero(mask)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def values(self, name: str) -> np.ndarray:
+        return np.asarray(self.store.column(name)[self._rows])
+
+    def _key(self, by: str) -> Tuple[np.ndarray, Any]:
+        """Integer key per selected row plus a decoder from key to label."""
+        if by in _BUCKETS:
+            width = _BUCKETS[by] * _US
+            k = self.values("ts") // width
+            return k, lambda v: datetime.fromtimestamp(int(v) * width / _US, timezone.utc).isoformat(timespec="minutes")
+        if by == "kind":
+            return self.values("kind").astype(np.int64), lambda v: KINDS[v]
+        if by in _DICT_OF:
+            names = self.store.dictionary(_DICT_OF[by])
+            return self.values(by).astype(np.int64), lambda v: names[v] if v >= 0 else None
+        raise ValueError(f"cannot group by {by!r}")
+
+    def _group(self, by: Union[str, Sequence[str]], weights: Optional[np.ndarray]) -> Dict[Any, float]:
+        if isinstance(by, str):
+            by = (by,)
+        if not len(self):
+            return {}
+        keys, decoders = zip(*(self._key(b) for b in by))
+        uniq, inverse = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        totals = np.bincount(inverse, weights=weights, minlength=len(uniq))
+        out = {}
+        for row, total in zip(uniq, totals):
+            label = tuple(d(v) for d, v in zip(decoders, row))
+            out[label[0] if len(label) == 1 else label] = float(total) if weights is not None else int(total)
+        return out
+
+    def sum(self, value: str = "amount", by: Union[None, str, Sequence[str]] = None):
+        w = self.values(value).astype(np.float64)
+        if by is None:
+            return float(w.sum())
+        return self._group(by, w)
+
+    def count(self, by: Union[None, str, Sequence[str]] = None):
+        if by is None:
+            return len(self)
+        return self._group(by, None)
+
+    def top(self, by: str = "src", n: int = 10, value: str = "amount") -> List[Tuple[Any, float]]:
+        totals = self.sum(value, by=by)
+        return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def files(self) -> List[str]:
+        """Vault filenames of the selected rows (for drilling into JSON)."""
+        return self.store.filenames(self._rows.tolist())
+
+
+_STORE: Optional[ColumnStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_columns(sync: bool = True) -> ColumnStore:
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ColumnStore(BASE)
+    if sync:
+        _STORE.sync()
+    return _STORE
+
+
+def main():
+    import argparse
+    ap = argparse.ArgumentParser(description="Export the TimeVault to columns and print summaries.")
+    ap.add_argument("--rebuild", action="store_true", help="drop the columns and re-export everything")
+    ap.add_argument("--top", type=int, default=5, help="top N senders by volume")
+    ap.add_argument("--hourly", action="store_true", help="volume per sender per hour")
+    args = ap.parse_args()
+
+    store = get_columns(sync=False)
+    added = store.rebuild() if args.rebuild else store.sync()
+    sel = store.select()
+    print(f"🧮 {store.rows} row(s), {added} appended, {len(sel)} live; "
+          f"{len(store.dictionary('account'))} account(s)")
+    print("by kind:", json.dumps(sel.count(by="kind")))
+    print(f"top {args.top} senders:")
+    # records without a sender decode to None
+    for acct, vol in sel.top("src", n=args.top):
+        print(f"   {str(acct):<16} {vol:>14.2f}")
+    if args.hourly:
+        for (acct, hour), vol in sorted(sel.sum("amount", by=("src", "hour")).items(), key=lambda kv: kv[0][1]):
+            print(f"   {hour}  {str(acct):<16} {vol:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
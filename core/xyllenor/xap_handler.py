@@ -1,11 +1,13 @@
 # ~/work/xyllidium/core/xyllenor/xap_handler.py
 import os, json, hashlib, base64, datetime
-from nacl.signing import SigningKey
-from nacl.encoding import HexEncoder
+
+from core import tracing
+from core.xyllencore.merkle_log import get_log
+from core.xyllencore.record_cache import get_cache
+from core.xyllencore.vault_index import get_index
 
 KEY_DIR = "core/keys"
 TIMEVAULT_DIR = "data/timevault"
-os.makedirs(TIMEVAULT_DIR, exist_ok=True)
 
 def load_keys():
     priv = open(f"{KEY_DIR}/node_private.key").read().strip().split("XYLL-PRIV-")[1]
@@ -13,7 +15,12 @@ def load_keys():
     nid = open(f"{KEY_DIR}/node_id.txt").read().strip()
     return priv, pub, nid
 
+@tracing.traced("make_xap")
 def make_xap(intent):
+    # nacl is only needed when actually signing
+    from nacl.signing import SigningKey
+    from nacl.encoding import HexEncoder
+
     priv_hex, pub_hex, node_id = load_keys()
     priv_key = SigningKey(bytes.fromhex(priv_hex))
     pub_key = f"XYLL-PUB-{pub_hex}"
@@ -43,7 +50,21 @@ def make_xap(intent):
         "signature": signature_prefixed,
     }
 
+    os.makedirs(TIMEVAULT_DIR, exist_ok=True)
     path = os.path.join(TIMEVAULT_DIR, f"{xap_id}.json")
-    with open(path, "w") as f: json.dump(record, f, indent=2)
+    index = get_index()
+    if index.anchored(record, "xap"):
+        try:
+            record = get_cache().load(path)
+            print(f"♻️ Intent already anchored → {path}")
+            return record
+        except FileNotFoundError:
+            pass  # decayed since the index last looked: anchor it again
+    index.check_prefix(record)
+    with index.writing(record, "xap"):
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2)
+    get_cache().invalidate(path)
+    get_log().append(record)
     print(f"📦 Stored XAP snapshot → {path}")
     return record
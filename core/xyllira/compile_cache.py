@@ -0,0 +1,179 @@
+"""
+Xyllira Compile Cache
+---------------------
+Memoizes parse + translate results keyed by a hash of the source text.
+
+- In-memory LRU of compiled graph templates
+- Optional on-disk store (one JSON file per source digest)
+- Node ids are remapped on every call, so the caller's Translator
+  counter advances exactly as if the source had been compiled fresh
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import copy
+import hashlib
+import json
+import logging
+
+from interpreter import XylliraParser
+from translator import GraphNode, IntentGraph, Translator
+
+
+log = logging.getLogger("xyllira.cache")
+
+CACHE_VERSION = "xcc.v1"
+
+
+def source_digest(text: str) -> str:
+    """SHA-256 of the Xyllira source text (hex)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _graph_to_template(graph: IntentGraph) -> Dict[str, Any]:
+    """
+    Strips the counter-dependent ids from a graph.
+    Edges are stored as (from_index, to_index) into the node list.
+    """
+    index = {n.id: i for i, n in enumerate(graph.nodes)}
+    return {
+        "version": CACHE_VERSION,
+        "nodes": [
+            {"type": n.type, "params": n.params, "constraints": n.constraints}
+            for n in graph.nodes
+        ],
+        "edges": [[index[a], index[b]] for a, b in graph.edges],
+    }
+
+
+def _template_to_graph(template: Dict[str, Any], translator: Translator) -> IntentGraph:
+    """Rebuilds a graph from a template, drawing fresh ids from `translator`."""
+    graph = IntentGraph()
+    ids: List[str] = []
+    for n in template["nodes"]:
+        node_id = translator._next_id(n["type"])
+        ids.append(node_id)
+        graph.add_node(GraphNode(
+            id=node_id,
+            type=n["type"],
+            params=copy.deepcopy(n["params"]),
+            constraints=copy.deepcopy(n["constraints"]),
+        ))
+    for a, b in template["edges"]:
+        graph.add_edge(ids[a], ids[b])
+    return graph
+
+
+class CompileCache:
+    """
+    Content-addressed cache of compiled Xyllira programs.
+
+    Usage:
+      cache = CompileCache(maxsize=256, store_dir="data/xyllira_cache")
+      graph = cache.compile(source)
+    """
+
+    def __init__(self, maxsize: int = 128, store_dir: Optional[Union[str, Path]] = None):
+        self.maxsize = maxsize
+        self.store_dir = Path(store_dir) if store_dir else None
+        if self.store_dir:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._lru: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._parser = XylliraParser()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ---- public API ----
+
+    def compile(self, text: str, translator: Optional[Translator] = None) -> IntentGraph:
+        """
+        Returns a ready IntentGraph for `text`.
+        If `translator` is given, node ids are drawn from its counter.
+        """
+        translator = translator or Translator()
+        digest = source_digest(text)
+
+        template = self._lru.get(digest)
+        if template is not None:
+            self._lru.move_to_end(digest)
+            self.hits += 1
+            return _template_to_graph(template, translator)
+
+        template = self._load(digest)
+        if template is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            intents = self._parser.parse(text)
+            template = _graph_to_template(Translator().translate(intents))
+            self._save(digest, template)
+
+        self._remember(digest, template)
+        return _template_to_graph(template, translator)
+
+    def clear(self):
+        self._lru.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._lru),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    # ---- helpers ----
+
+    def _remember(self, digest: str, template: Dict[str, Any]):
+        self._lru[digest] = template
+        self._lru.move_to_end(digest)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def _path(self, digest: str) -> Optional[Path]:
+        if not self.store_dir:
+            return None
+        return self.store_dir / f"{digest}.json"
+
+    def _load(self, digest: str) -> Optional[Dict[str, Any]]:
+        path = self._path(digest)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                template = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if template.get("version") != CACHE_VERSION:
+            return None
+        return template
+
+    def _save(self, digest: str, template: Dict[str, Any]):
+        path = self._path(digest)
+        if path is None:
+            return
+        tmp = path.with_suffix(".json.tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(template, f)
+            tmp.replace(path)
+        except OSError as e:
+            # the disk store is best-effort: the compiled graph is still returned
+            log.warning(f"⚠️ compile cache not saved to {path}: {e}")
+            tmp.unlink(missing_ok=True)
+
+
+# ---------- Example runner (optional) ----------
+
+if __name__ == "__main__":
+    from run_pipeline import XYLLIRA_CODE
+
+    cache = CompileCache()
+    translator = Translator()
+    for _ in range(3):
+        graph = cache.compile(XYLLIRA_CODE, translator)
+        print([n.id for n in graph.nodes])
+    print("📊 Cache stats:", cache.stats())
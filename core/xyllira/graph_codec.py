@@ -0,0 +1,296 @@
+"""
+Xyllira Graph Codec (xig.v1)
+----------------------------
+Compact binary wire format for IntentGraph, alongside the debug JSON form.
+
+Layout:
+  header   b"XIG" + version byte
+  records  tag byte + payload, until REC_END
+
+  REC_STR   varint length + utf-8 bytes       (interned; index = order of definition)
+  REC_NODE  varint id_ref, varint type_ref, value params, value constraints
+  REC_EDGE  varint from_ref, varint to_ref
+  REC_RESET —                                  (empties the string table)
+  REC_END   —
+
+Values are self-tagged (None/bool/int/float/str/list/map). Integers and
+integral floats are zigzag varints, other floats are packed little-endian
+float64, strings and map keys are references into the interned table.
+
+Records are independent, so graphs can be encoded from any node/edge
+iterator and decoded record-by-record without holding the whole graph.
+Node ids are mostly unique, so the string table is bounded: once it holds
+MAX_STRINGS entries the encoder emits REC_RESET before the next record and
+both sides start a fresh table. Memory stays O(MAX_STRINGS) on either end.
+"""
+
+from __future__ import annotations
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union
+import io
+import struct
+
+from translator import GraphNode, IntentGraph
+
+
+MAGIC = b"XIG"
+VERSION = 1
+
+REC_END = 0x00
+REC_STR = 0x01
+REC_NODE = 0x02
+REC_EDGE = 0x03
+REC_RESET = 0x04
+
+MAX_STRINGS = 4096
+
+V_NONE = ord("N")
+V_TRUE = ord("T")
+V_FALSE = ord("F")
+V_INT = ord("I")
+V_INTF = ord("J")    # integral float, stored as varint
+V_FLOAT = ord("D")
+V_STR = ord("S")
+V_LIST = ord("L")
+V_MAP = ord("M")
+
+_F64 = struct.Struct("<d")
+
+
+class CodecError(ValueError):
+    pass
+
+
+# ---------- Varints ----------
+
+def _put_uvarint(buf: bytearray, n: int):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _put_svarint(buf: bytearray, n: int):
+    _put_uvarint(buf, (n << 1) if n >= 0 else ((-n << 1) - 1))
+
+
+def _read_exact(fp: BinaryIO, n: int) -> bytes:
+    b = fp.read(n)
+    if len(b) != n:
+        raise CodecError("truncated xig stream")
+    return b
+
+
+def _get_uvarint(fp: BinaryIO) -> int:
+    shift = 0
+    out = 0
+    while True:
+        b = _read_exact(fp, 1)[0]
+        out |= (b & 0x7F) << shift
+        if b < 0x80:
+            return out
+        shift += 7
+
+
+def _get_svarint(fp: BinaryIO) -> int:
+    z = _get_uvarint(fp)
+    return (z >> 1) if not (z & 1) else -((z + 1) >> 1)
+
+
+# ---------- Encoder ----------
+
+class GraphEncoder:
+    """
+    Incremental encoder. Call `node()` / `edge()` in any order and
+    collect the returned chunks; `header()` first, `end()` last.
+    """
+
+    def __init__(self, max_strings: int = MAX_STRINGS):
+        self._strings: Dict[str, int] = {}
+        self.max_strings = max_strings
+
+    def header(self) -> bytes:
+        return MAGIC + bytes([VERSION])
+
+    def end(self) -> bytes:
+        return bytes([REC_END])
+
+    def node(self, node: GraphNode) -> bytes:
+        defs = self._begin()
+        body = bytearray([REC_NODE])
+        _put_uvarint(body, self._ref(node.id, defs))
+        _put_uvarint(body, self._ref(node.type, defs))
+        self._value(body, node.params, defs)
+        self._value(body, node.constraints, defs)
+        return bytes(defs + body)
+
+    def edge(self, from_id: str, to_id: str) -> bytes:
+        defs = self._begin()
+        body = bytearray([REC_EDGE])
+        _put_uvarint(body, self._ref(from_id, defs))
+        _put_uvarint(body, self._ref(to_id, defs))
+        return bytes(defs + body)
+
+    # ---- helpers ----
+
+    def _begin(self) -> bytearray:
+        """Definitions prefix for the next record; resets a full string table."""
+        if len(self._strings) < self.max_strings:
+            return bytearray()
+        self._strings.clear()
+        return bytearray([REC_RESET])
+
+    def _ref(self, s: str, defs: bytearray) -> int:
+        idx = self._strings.get(s)
+        if idx is None:
+            idx = len(self._strings)
+            self._strings[s] = idx
+            raw = s.encode("utf-8")
+            defs.append(REC_STR)
+            _put_uvarint(defs, len(raw))
+            defs += raw
+        return idx
+
+    def _value(self, buf: bytearray, v: Any, defs: bytearray):
+        if v is None:
+            buf.append(V_NONE)
+        elif v is True:
+            buf.append(V_TRUE)
+        elif v is False:
+            buf.append(V_FALSE)
+        elif isinstance(v, int):
+            buf.append(V_INT)
+            _put_svarint(buf, v)
+        elif isinstance(v, float):
+            if v.is_integer() and abs(v) < 2**53:
+                buf.append(V_INTF)
+                _put_svarint(buf, int(v))
+            else:
+                buf.append(V_FLOAT)
+                buf += _F64.pack(v)
+        elif isinstance(v, str):
+            buf.append(V_STR)
+            _put_uvarint(buf, self._ref(v, defs))
+        elif isinstance(v, (list, tuple)):
+            buf.append(V_LIST)
+            _put_uvarint(buf, len(v))
+            for item in v:
+                self._value(buf, item, defs)
+        elif isinstance(v, dict):
+            buf.append(V_MAP)
+            _put_uvarint(buf, len(v))
+            for k, item in v.items():
+                _put_uvarint(buf, self._ref(str(k), defs))
+                self._value(buf, item, defs)
+        else:
+            raise CodecError(f"unsupported value type: {type(v).__name__}")
+
+
+def iter_encode(
+    nodes: Iterable[GraphNode],
+    edges: Iterable[Tuple[str, str]] = (),
+) -> Iterator[bytes]:
+    """Streams an encoded graph as byte chunks (one per record)."""
+    enc = GraphEncoder()
+    yield enc.header()
+    for n in nodes:
+        yield enc.node(n)
+    for a, b in edges:
+        yield enc.edge(a, b)
+    yield enc.end()
+
+
+def encode_to(fp: BinaryIO, nodes: Iterable[GraphNode], edges: Iterable[Tuple[str, str]] = ()) -> int:
+    """Writes an encoded graph to a binary stream; returns bytes written."""
+    written = 0
+    for chunk in iter_encode(nodes, edges):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def encode(graph: IntentGraph) -> bytes:
+    return b"".join(iter_encode(graph.nodes, graph.edges))
+
+
+# ---------- Decoder ----------
+
+def _read_value(fp: BinaryIO, strings: List[str]) -> Any:
+    tag = _read_exact(fp, 1)[0]
+    if tag == V_NONE:
+        return None
+    if tag == V_TRUE:
+        return True
+    if tag == V_FALSE:
+        return False
+    if tag == V_INT:
+        return _get_svarint(fp)
+    if tag == V_INTF:
+        return float(_get_svarint(fp))
+    if tag == V_FLOAT:
+        return _F64.unpack(_read_exact(fp, 8))[0]
+    if tag == V_STR:
+        return _string(strings, _get_uvarint(fp))
+    if tag == V_LIST:
+        return [_read_value(fp, strings) for _ in range(_get_uvarint(fp))]
+    if tag == V_MAP:
+        out = {}
+        for _ in range(_get_uvarint(fp)):
+            k = _string(strings, _get_uvarint(fp))
+            out[k] = _read_value(fp, strings)
+        return out
+    raise CodecError(f"unknown value tag 0x{tag:02x}")
+
+
+def _string(strings: List[str], idx: int) -> str:
+    try:
+        return strings[idx]
+    except IndexError:
+        raise CodecError(f"undefined string ref {idx}") from None
+
+
+def iter_decode(fp: BinaryIO) -> Iterator[Tuple[str, Union[GraphNode, Tuple[str, str]]]]:
+    """
+    Streams records from a binary stream:
+      ("node", GraphNode) or ("edge", (from_id, to_id))
+    """
+    head = _read_exact(fp, len(MAGIC) + 1)
+    if head[:len(MAGIC)] != MAGIC:
+        raise CodecError("not an xig stream")
+    if head[-1] != VERSION:
+        raise CodecError(f"unsupported xig version {head[-1]}")
+
+    strings: List[str] = []
+    while True:
+        tag = _read_exact(fp, 1)[0]
+        if tag == REC_END:
+            return
+        if tag == REC_STR:
+            strings.append(_read_exact(fp, _get_uvarint(fp)).decode("utf-8"))
+        elif tag == REC_RESET:
+            strings.clear()
+        elif tag == REC_NODE:
+            node_id = _string(strings, _get_uvarint(fp))
+            node_type = _string(strings, _get_uvarint(fp))
+            params = _read_value(fp, strings)
+            constraints = _read_value(fp, strings)
+            yield "node", GraphNode(id=node_id, type=node_type, params=params, constraints=constraints)
+        elif tag == REC_EDGE:
+            a = _string(strings, _get_uvarint(fp))
+            b = _string(strings, _get_uvarint(fp))
+            yield "edge", (a, b)
+        else:
+            raise CodecError(f"unknown record tag 0x{tag:02x}")
+
+
+def decode_from(fp: BinaryIO) -> IntentGraph:
+    graph = IntentGraph()
+    for kind, item in iter_decode(fp):
+        if kind == "node":
+            graph.add_node(item)
+        else:
+            graph.add_edge(*item)
+    return graph
+
+
+def decode(data: bytes) -> IntentGraph:
+    return decode_from(io.BytesIO(data))
@@ -4,8 +4,8 @@ Xyllira code -> Interpreter -> Translator -> JSON graph for Xyllencore
 """
 
 import json
-from interpreter import XylliraParser
 from translator import Translator
+from compile_cache import CompileCache
 
 XYLLIRA_CODE = """
 intent transfer {
@@ -34,9 +34,6 @@ intent convert {
 """
 
 if __name__ == "__main__":
-    parser = XylliraParser()
-    intents = parser.parse(XYLLIRA_CODE)
-
-    graph = Translator().translate(intents)
+    graph = CompileCache().compile(XYLLIRA_CODE, Translator())
     print("🧠 Intent Graph JSON:")
     print(graph.to_json())
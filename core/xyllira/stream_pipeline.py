@@ -0,0 +1,305 @@
+"""
+Xyllira → Xyllenor Streaming Pipeline
+-------------------------------------
+Streams a (possibly huge) Xyllira intent file into the equilibrium engine:
+
+  read+parse  →  translate  →  submit (one persistent WS connection)
+
+Stages are joined by bounded asyncio queues, so a slow engine pushes back
+on the reader instead of letting translated intents pile up in memory.
+Only Transfer nodes are submitted; other node types are counted as skipped.
+
+Usage:
+  python core/xyllira/stream_pipeline.py intents.xyl
+  python core/xyllira/stream_pipeline.py - < intents.xyl --dry-run
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+import argparse
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+
+from interpreter import XylliraParser
+from translator import GraphNode, Translator
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+log = logging.getLogger("xyllira.stream")
+
+WS_URI = os.environ.get("XYLL_ENGINE_WS", "ws://127.0.0.1:8765")
+READ_CHUNK = 1 << 16
+FAILURE_SAMPLE = 20     # node ids kept per failure reason
+_DONE = object()
+
+
+# ---------- Source reading ----------
+
+def iter_intents(fp: TextIO, chunk_size: int = READ_CHUNK) -> Iterator[Dict[str, Any]]:
+    """
+    Yields parsed intents from a text stream without reading it whole.
+    Intent bodies cannot contain '}', so every closing brace is a safe cut.
+    """
+    parser = XylliraParser()
+    buf = ""
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        buf += chunk
+        cut = buf.rfind("}")
+        if cut < 0:
+            continue
+        yield from parser.parse(buf[:cut + 1])
+        buf = buf[cut + 1:]
+    if buf.strip():
+        yield from parser.parse(buf)
+
+
+def node_to_engine_intent(node: GraphNode, permanent: bool = True) -> Dict[str, Any]:
+    """Builds the executor-style transfer envelope the engine's ws_handler expects."""
+    p = node.params
+    ts = datetime.datetime.utcnow().isoformat(timespec="seconds")
+    digest = hashlib.sha256(f"{p['from']}{p['to']}{ts}{node.id}".encode()).hexdigest()[:8].upper()
+    return {
+        "type": "transfer",
+        "from": p["from"],
+        "to": p["to"],
+        "amount": float(p.get("amount", 0.0)),
+        "unit": p.get("unit", "xyls"),
+        "timestamp": ts,
+        "permanent": permanent,
+        "id": f"XYLL-TXN-{digest}",
+        "node": node.id,
+    }
+
+
+# ---------- Stats ----------
+
+@dataclass
+class PipelineStats:
+    parsed: int = 0
+    translated: int = 0
+    submitted: int = 0
+    acked: int = 0
+    skipped: int = 0
+    failed: int = 0
+    failures: Dict[str, int] = field(default_factory=dict)              # reason -> count
+    failure_sample: Dict[str, List[str]] = field(default_factory=dict)  # reason -> first node ids
+    started: float = field(default_factory=time.monotonic)
+
+    def fail(self, node_id: str, reason: str):
+        """Counts a failure; memory stays bounded however many intents fail."""
+        self.failed += 1
+        self.failures[reason] = self.failures.get(reason, 0) + 1
+        sample = self.failure_sample.setdefault(reason, [])
+        if len(sample) < FAILURE_SAMPLE:
+            sample.append(node_id)
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.acked / elapsed if elapsed > 0 else 0.0
+
+    def progress(self) -> str:
+        return (f"parsed={self.parsed} translated={self.translated} "
+                f"acked={self.acked}/{self.submitted} skipped={self.skipped} "
+                f"failed={self.failed} | {self.rate():.1f} intents/s")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "parsed": self.parsed,
+            "translated": self.translated,
+            "submitted": self.submitted,
+            "acked": self.acked,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_s": round(time.monotonic() - self.started, 3),
+            "throughput_per_s": round(self.rate(), 1),
+            "failures": [{"error": e, "count": c, "nodes": self.failure_sample[e]}
+                         for e, c in sorted(self.failures.items(), key=lambda kv: -kv[1])],
+        }
+
+
+# ---------- Stages ----------
+
+async def _read_stage(fp: TextIO, out_q: asyncio.Queue, stats: PipelineStats):
+    for intent in iter_intents(fp):
+        stats.parsed += 1
+        await out_q.put(intent)
+    await out_q.put(_DONE)
+
+
+async def _translate_stage(in_q: asyncio.Queue, out_q: asyncio.Queue, stats: PipelineStats):
+    translator = Translator()
+    while True:
+        intent = await in_q.get()
+        if intent is _DONE:
+            await out_q.put(_DONE)
+            return
+        for node in translator.translate([intent]).nodes:
+            stats.translated += 1
+            if node.type != "Transfer" or "from" not in node.params or "to" not in node.params:
+                stats.skipped += 1
+                continue
+            await out_q.put(node)
+
+
+async def _submit_stage(in_q: asyncio.Queue, stats: PipelineStats, uri: str,
+                        window: int, dry_run: bool, permanent: bool, max_retries: int = 5):
+    """
+    Keeps up to `window` intents in flight on one connection. The engine
+    acks in order, so a FIFO of pending node ids pairs acks with intents.
+    On disconnect the in-flight intents are failed and the stream resumes
+    on a fresh connection with exponential backoff.
+    """
+    if dry_run:
+        while (node := await in_q.get()) is not _DONE:
+            stats.submitted += 1
+            stats.acked += 1
+        return
+
+    import websockets
+
+    backoff, retries = 0.5, 0
+    carry: Any = None
+    while True:
+        try:
+            async with websockets.connect(uri, max_size=2**23) as ws:
+                backoff, retries = 0.5, 0
+                pending: asyncio.Queue = asyncio.Queue()
+                slots = asyncio.Semaphore(window)
+
+                async def receiver():
+                    while True:
+                        node_id = await pending.get()
+                        if node_id is _DONE:
+                            return
+                        try:
+                            ack = json.loads(await ws.recv())
+                        except Exception as e:
+                            stats.fail(node_id, f"connection lost: {e}")
+                            while not pending.empty():
+                                rest = pending.get_nowait()
+                                if rest is not _DONE:
+                                    stats.fail(rest, "connection lost")
+                            raise
+                        slots.release()
+                        if ack.get("ok"):
+                            stats.acked += 1
+                        else:
+                            stats.fail(node_id, ack.get("error", "rejected"))
+
+                recv_task = asyncio.create_task(receiver())
+                slot = None
+                try:
+                    while True:
+                        node, carry = (carry if carry is not None else await in_q.get()), None
+                        if node is _DONE:
+                            pending.put_nowait(_DONE)
+                            break
+                        slot = asyncio.ensure_future(slots.acquire())
+                        done, _ = await asyncio.wait({slot, recv_task}, return_when=asyncio.FIRST_COMPLETED)
+                        if recv_task in done:
+                            slot.cancel()
+                            carry = node
+                            break
+                        pending.put_nowait(node.id)
+                        await ws.send(json.dumps(node_to_engine_intent(node, permanent)))
+                        stats.submitted += 1
+                    await recv_task
+                    return
+                finally:
+                    # a send failure or cancellation leaves the receiver parked on a
+                    # dead socket: stop it before reconnecting, fail what it held
+                    if slot is not None:
+                        slot.cancel()
+                    if not recv_task.done():
+                        recv_task.cancel()
+                        try:
+                            await recv_task
+                        except (asyncio.CancelledError, Exception):
+                            pass
+                        while not pending.empty():
+                            rest = pending.get_nowait()
+                            if rest is not _DONE:
+                                stats.fail(rest, "connection lost")
+        except Exception as e:
+            retries += 1
+            if retries > max_retries:
+                log.error(f"❌ engine unavailable after {max_retries} retries: {e}")
+                await _drain_failed(in_q, stats, carry, "engine unavailable")
+                return
+            log.warning(f"⚠️ engine connection failed ({e}); retrying in {backoff:.1f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 8.0)
+
+
+async def _drain_failed(in_q: asyncio.Queue, stats: PipelineStats, carry: Any, reason: str):
+    """Consumes the rest of the stream as failures so upstream stages can finish."""
+    node = carry if carry is not None else await in_q.get()
+    while node is not _DONE:
+        stats.fail(node.id, reason)
+        node = await in_q.get()
+
+
+async def _report(stats: PipelineStats, every: float):
+    while True:
+        await asyncio.sleep(every)
+        log.info(f"⏱️ {stats.progress()}")
+
+
+async def run_stream(fp: TextIO, uri: str = WS_URI, queue_size: int = 256, window: int = 32,
+                     dry_run: bool = False, permanent: bool = True,
+                     report_every: float = 2.0) -> PipelineStats:
+    stats = PipelineStats()
+    parsed_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    nodes_q: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    reporter = asyncio.create_task(_report(stats, report_every))
+    try:
+        await asyncio.gather(
+            _read_stage(fp, parsed_q, stats),
+            _translate_stage(parsed_q, nodes_q, stats),
+            _submit_stage(nodes_q, stats, uri, window, dry_run, permanent),
+        )
+    finally:
+        reporter.cancel()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    ap = argparse.ArgumentParser(description="Stream Xyllira intents into the Xyllenor engine.")
+    ap.add_argument("source", help="Xyllira file, or '-' for stdin")
+    ap.add_argument("--uri", default=WS_URI)
+    ap.add_argument("--queue-size", type=int, default=256, help="bound for each inter-stage queue")
+    ap.add_argument("--window", type=int, default=32, help="max un-acked intents in flight")
+    ap.add_argument("--report-every", type=float, default=2.0, help="progress interval (s)")
+    ap.add_argument("--dry-run", action="store_true", help="parse + translate only")
+    ap.add_argument("--non-permanent", action="store_true")
+    args = ap.parse_args(argv)
+
+    fp = sys.stdin if args.source == "-" else open(args.source, "r", encoding="utf-8")
+    try:
+        stats = asyncio.run(run_stream(
+            fp, uri=args.uri, queue_size=args.queue_size, window=args.window,
+            dry_run=args.dry_run, permanent=not args.non_permanent,
+            report_every=args.report_every,
+        ))
+    finally:
+        if fp is not sys.stdin:
+            fp.close()
+
+    log.info(f"✅ {stats.progress()}")
+    print("📊 Pipeline summary:")
+    print(json.dumps(stats.summary(), indent=2))
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -101,6 +101,16 @@ class IntentGraph:
             indent=2
         )
 
+    def to_bytes(self) -> bytes:
+        """Compact binary wire form (see graph_codec.py); JSON stays for debugging."""
+        from graph_codec import encode
+        return encode(self)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IntentGraph":
+        from graph_codec import decode
+        return decode(data)
+
 
 # ---------- Translator ----------
 
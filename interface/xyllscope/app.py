@@ -2,26 +2,45 @@
 # Combines visuals of v2.3 + renderer patch of v3.5.8.1
 # Works on Dash>=8, NumPy>=1.26
 
-import os, json, threading, asyncio
+import os, json, threading, asyncio, time
 from collections import deque
 from datetime import datetime
 import numpy as np
 import plotly.graph_objects as go
 import dash
-from dash import dcc, html, Output, Input
+from dash import dcc, html, Output, Input, State, Patch
 import dash_bootstrap_components as dbc
 
+from components.bridge_feed import BridgeFeed, coalesce
+from components.field_stats import FieldStats
+from components.history_store import HistoryStore
+from components.render_cache import RenderCache
+
+try:
+    from core.readiness import notify_ready, READY_ENV
+except ImportError:  # launched from interface/xyllscope without the repo root on the path
+    notify_ready, READY_ENV = None, None
+
 # --- configuration ---
 GRID = (16,16)
-state = dict(Z=np.zeros(GRID), hist=deque(maxlen=300), ai=[], tick=0, connected=False)
+HISTORY_POINTS = 600   # point budget for the coherence line at any zoom
+LOG_CAP = 2000         # lines kept server-side
+state = dict(Z=np.zeros(GRID), history=HistoryStore(),
+             ai=deque(maxlen=LOG_CAP), ai_seq=0, tick=0, coh=0.0,
+             stepped_at=0.0, connected=False)
+TICK_S = 0.9
+feed = BridgeFeed(uri=f"ws://127.0.0.1:{os.environ.get('XYLL_BRIDGE_PORT', '8765')}")
+renders = RenderCache()
+_step_lock = threading.Lock()
 
 # --- utilities ---
 def ts(): return datetime.now().strftime("%H:%M:%S")
-def log(msg): state["ai"].append(f"[{ts()}] {msg}")
+def log(msg):
+    state["ai"].append(f"[{ts()}] {msg}")
+    state["ai_seq"]+=1
 
-def coherence(Z):
-    m,s=np.mean(Z),np.std(Z)
-    return float(max(0,min(1,1-s/(m+1e-9))))
+# running sums over Z: coherence is read in O(1), updated per pulsed cell
+state["stats"]=FieldStats(state["Z"])
 
 # --- visuals ---
 def surface(Z):
@@ -42,19 +61,33 @@ def heat(Z):
                       plot_bgcolor="rgba(0,0,0,0)",height=220)
     return fig
 
-def line(y):
-    fig=go.Figure(go.Scatter(y=y,mode="lines",line=dict(color="#00FFFF",width=2)))
+def line(y,x=None):
+    fig=go.Figure(go.Scatter(x=x,y=y,mode="lines",line=dict(color="#00FFFF",width=2)))
     fig.update_layout(margin=dict(l=10,r=10,t=20,b=20),
                       paper_bgcolor="rgba(0,0,0,0)",
                       plot_bgcolor="rgba(0,0,0,0)",height=200)
     return fig
 
+# --- live bridge feed ---
+def live_step():
+    """Apply everything the bridge sent since the last tick, coalesced."""
+    pulses,lines=coalesce(feed.drain(),GRID)
+    Z,stats=state["Z"],state["stats"]
+    stats.scale(0.95)
+    # decay keeps Z in [0, 1]; only pulsed cells can leave it
+    for (x,y),amp in pulses.items():
+        stats.apply((x,y),min(1.0,max(0.0,Z[x,y]+amp)))
+    for msg in lines:
+        log(msg)
+
 # --- mock update loop ---
 def offline_step():
     Z=state["Z"]
     wave=np.sin(0.1*state["tick"]+np.linspace(0,3.14,GRID[0]))[None,:]
-    Z=0.9*Z+0.1*wave
-    state["Z"]=np.clip(Z,0,1)
+    Z*=0.9
+    Z+=0.1*wave
+    np.clip(Z,0,1,out=Z)
+    state["stats"].resync()  # the mock wave moves every cell
 
 # --- dash app ---
 app=dash.Dash(__name__,external_stylesheets=[dbc.themes.CYBORG],
@@ -70,32 +103,136 @@ app.index_string="""
   </body>
 </html>"""
 
-app.layout=dbc.Container([
-    html.H1("🧠 Xyllscope – Cognitive Field Monitor",
-            style={"color":"#6ee7ff","marginTop":"10px"}),
-    dbc.Row([
-        dbc.Col(dbc.Button("Start/Stop",id="btn",color="danger",outline=True,size="sm")),
-    ]),
-    dbc.Row([
-        dbc.Col(dcc.Graph(id="surf",figure=surface(state["Z"])),md=7),
-        dbc.Col([dcc.Graph(id="heat",figure=heat(state["Z"])),
-                 dcc.Graph(id="line",figure=line([]))],md=5)
-    ],className="mt-3"),
-    html.Pre(id="ai",style={"height":"160px","overflowY":"auto"}),
-    html.Div(id="status",style={"color":"#6ee7ff"}),
-    dcc.Interval(id="tick",interval=900,n_intervals=0)
-],fluid=True)
+LOG_LINES=200
+
+def history_xy(start=None,end=None):
+    t,v=state["history"].query(start,end,max_points=HISTORY_POINTS)
+    return t.tolist(),v.tolist()
+
+def patch_line(x,y):
+    p=Patch()
+    p["data"][0]["x"]=x
+    p["data"][0]["y"]=y
+    return p
+
+def serve_layout():
+    # built per page load; ticks after that only send deltas (see update)
+    hx,hy=history_xy()
+    return dbc.Container([
+        html.H1("🧠 Xyllscope – Cognitive Field Monitor",
+                style={"color":"#6ee7ff","marginTop":"10px"}),
+        dbc.Row([
+            dbc.Col(dbc.Button("Start/Stop",id="btn",color="danger",outline=True,size="sm")),
+        ]),
+        dbc.Row([
+            dbc.Col(dcc.Graph(id="surf",figure=surface(state["Z"])),md=7),
+            dbc.Col([dcc.Graph(id="heat",figure=heat(state["Z"])),
+                     dcc.Graph(id="line",figure=line(hy,hx))],md=5)
+        ],className="mt-3"),
+        html.Pre(id="ai",children=[entry+"\n" for entry in list(state["ai"])[-LOG_LINES:]],
+                 style={"height":"160px","overflowY":"auto"}),
+        html.Div(id="status",style={"color":"#6ee7ff"}),
+        dcc.Store(id="ai-cursor",data=dict(log=state["ai_seq"],tick=state["tick"],line=state["tick"])),
+        dcc.Interval(id="tick",interval=int(TICK_S*1000),n_intervals=0)
+    ],fluid=True)
+
+app.layout=serve_layout
+
+def patch_z(Z):
+    p=Patch()
+    p["data"][0]["z"]=Z
+    return p
+
+def patch_log(cursor):
+    """New log lines since this session's cursor, trimmed to LOG_LINES on the client."""
+    total=state["ai_seq"]
+    fresh=min(total-cursor,len(state["ai"]),LOG_LINES)
+    new=[state["ai"][i] for i in range(len(state["ai"])-fresh,len(state["ai"]))]
+    p=Patch()
+    p.extend([entry+"\n" for entry in new])
+    # drop the oldest lines so the client keeps at most LOG_LINES
+    shown=min(cursor,LOG_LINES)
+    for _ in range(max(0,shown+len(new)-LOG_LINES)):
+        del p[0]
+    return p,total
+
+def advance():
+    """Step the shared field at most once per tick interval, however many sessions poll."""
+    with _step_lock:
+        now=time.monotonic()
+        if now-state["stepped_at"]<TICK_S*0.9:
+            return
+        state["stepped_at"]=now
+        state["connected"]=feed.connected
+        if state["connected"] or feed.buffer:
+            live_step()
+        else:
+            offline_step()
+        state["tick"]+=1
+        state["coh"]=state["stats"].coherence()
+        state["history"].append(state["tick"],state["coh"])
+
+def extend_line(since,v):
+    """extendData for every tick in [since, v], not just the newest one."""
+    x,y=history_xy(since,v)
+    return dict(x=[x],y=[y]),[0]
 
 @app.callback(Output("surf","figure"),Output("heat","figure"),
-              Output("line","figure"),Output("ai","children"),
-              Output("status","children"),
-              Input("tick","n_intervals"))
-def update(_):
-    offline_step()
-    state["tick"]+=1
-    coh=coherence(state["Z"]); state["hist"].append(coh)
-    return (surface(state["Z"]),heat(state["Z"]),line(state["hist"]),
-            "\n".join(state["ai"][-200:]),f"Tick {state['tick']} | coherence {coh:.3f}")
+              Output("line","extendData"),Output("line","figure",allow_duplicate=True),
+              Output("ai","children"),Output("ai-cursor","data"),Output("status","children"),
+              Input("tick","n_intervals"),State("ai-cursor","data"),State("line","relayoutData"),
+              prevent_initial_call=True)
+def update(_,seen,relayout):
+    advance()
+    seen=seen or {}
+    v=state["tick"]
+    if seen.get("tick")==v:
+        return (dash.no_update,)*7
+    # payloads are built once per field version and shared by all sessions
+    z=renders.get(v,"z",lambda: state["Z"].tolist())
+    since=seen.get("tick",v-1)+1
+    served=seen.get("line",v)
+    point,full=dash.no_update,dash.no_update
+    if v-served>=HISTORY_POINTS:
+        # the client only appends; re-serve the decimated series so it stays
+        # at the point budget and keeps the full history (or the zoomed window)
+        relayout=relayout or {}
+        if "xaxis.range[0]" in relayout:
+            full=patch_line(*history_xy(relayout["xaxis.range[0]"],relayout["xaxis.range[1]"]))
+        else:
+            full=renders.get(v,"line",lambda: patch_line(*history_xy()))
+        served=v
+    elif since==v:
+        point=renders.get(v,"point",lambda: extend_line(v,v))
+    else:
+        point=extend_line(since,v)
+    status=renders.get(v,"status",lambda: (
+        f"Tick {v} | coherence {state['coh']:.3f} | "
+        f"{'live' if state['connected'] else 'offline'} (dropped {feed.dropped})"))
+    logs,cursor=patch_log(seen.get("log",0))
+    return (patch_z(z),patch_z(z),point,full,logs,dict(log=cursor,tick=v,line=served),status)
+
+@app.callback(Output("line","figure"),Input("line","relayoutData"),
+              prevent_initial_call=True)
+def zoom(relayout):
+    """Re-serve the coherence line at the resolution of the visible window."""
+    relayout=relayout or {}
+    if "xaxis.range[0]" in relayout:
+        x,y=history_xy(relayout["xaxis.range[0]"],relayout["xaxis.range[1]"])
+    elif relayout.get("xaxis.autorange"):
+        x,y=history_xy()
+    else:
+        return dash.no_update
+    return patch_line(x,y)
 
 if __name__=="__main__":
-    app.run(host="127.0.0.1",port=8050,debug=True)
+    feed.start()
+    port=int(os.environ.get("XYLL_SCOPE_PORT","8050"))
+    if notify_ready and os.environ.get(READY_ENV):
+        # supervised: bind first, report ready, no reloader
+        from werkzeug.serving import make_server
+        srv=make_server("127.0.0.1",port,app.server,threaded=True)
+        notify_ready("scope",port=port)
+        srv.serve_forever()
+    else:
+        app.run(host="127.0.0.1",port=port,debug=True)
@@ -1,9 +1,13 @@
 import plotly.graph_objects as go
 
-def make_chrono_trace(state):
+from components.history_store import minmax_decimate
+
+def make_chrono_trace(state, max_points=600):
+    # min/max decimation keeps spikes visible at a fixed point budget
+    t, coh = minmax_decimate(state["time"], state["coherence"], max_points)
     fig = go.Figure()
     fig.add_trace(go.Scatter(
-        y=state["coherence"], x=state["time"],
+        y=coh, x=t,
         mode="lines+markers", line=dict(color="#0ff")
     ))
     fig.update_layout(
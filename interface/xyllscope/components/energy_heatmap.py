@@ -1,9 +1,12 @@
 import plotly.graph_objects as go
 import numpy as np
 
-def make_energy_heatmap(energies):
-    # 2D projection for visualization
-    avg_plane = np.mean(energies, axis=2)
+def make_energy_heatmap(energies, projections=None):
+    # 2D projection for visualization; reuse the maintained plane when available
+    if projections is not None:
+        avg_plane = projections.mean(axis=2)
+    else:
+        avg_plane = np.mean(energies, axis=2)
 
     fig = go.Figure(
         data=go.Heatmap(
@@ -14,3 +14,63 @@ class EquilibriumEngine:
         self.diffusion_strength = np.clip(self.diffusion_strength - delta*self.adapt_rate, 0.2, 0.8)
         self.pulse_strength = np.clip(self.pulse_strength + delta*self.adapt_rate, 0.2, 1.0)
         return self.diffusion_strength, self.pulse_strength
+
+
+class RegionalEquilibriumEngine:
+    """Array-backed EquilibriumEngine: one diffusion/pulse pair per region.
+
+    `labels` maps every voxel to a region id in [0, n_regions). Targets and
+    adapt rates may be scalars or per-region arrays; all regions are
+    regulated together in one vectorised update.
+    """
+
+    def __init__(self, labels, n_regions=None, target=0.75, adapt_rate=0.02,
+                 diffusion_strength=0.4, pulse_strength=0.5):
+        self.labels = np.asarray(labels, dtype=np.intp)
+        self._flat = self.labels.ravel()
+        self.n_regions = int(n_regions if n_regions is not None else self._flat.max() + 1)
+        n = self.n_regions
+        self.target = np.full(n, target, dtype=float) if np.isscalar(target) else np.asarray(target, dtype=float).copy()
+        self.adapt_rate = np.full(n, adapt_rate, dtype=float) if np.isscalar(adapt_rate) else np.asarray(adapt_rate, dtype=float).copy()
+        self.diffusion_strength = np.full(n, diffusion_strength, dtype=float)
+        self.pulse_strength = np.full(n, pulse_strength, dtype=float)
+        self._counts = np.maximum(np.bincount(self._flat, minlength=n), 1).astype(float)
+        self._delta = np.empty(n)
+
+    @classmethod
+    def blocks(cls, shape, block, **kw):
+        """Partition a grid into regions of `block` voxels per axis."""
+        block = (block,) * len(shape) if np.isscalar(block) else tuple(block)
+        nb = [-(-s // b) for s, b in zip(shape, block)]
+        idx = np.meshgrid(*(np.arange(s) // b for s, b in zip(shape, block)), indexing="ij")
+        labels = np.ravel_multi_index(idx, nb)
+        return cls(labels, n_regions=int(np.prod(nb)), **kw)
+
+    def coherence(self, energies):
+        """Per-region coherence (1 - std/mean) from one bincount pass each."""
+        e = np.asarray(energies).ravel()
+        s1 = np.bincount(self._flat, weights=e, minlength=self.n_regions)
+        s2 = np.bincount(self._flat, weights=e * e, minlength=self.n_regions)
+        mean = s1 / self._counts
+        std = np.sqrt(np.maximum(s2 / self._counts - mean * mean, 0.0))
+        return np.clip(1 - std / (mean + 1e-9), 0, 1)
+
+    def regulate(self, coherence):
+        np.subtract(coherence, self.target, out=self._delta)
+        self._delta *= self.adapt_rate
+        self.diffusion_strength -= self._delta
+        np.clip(self.diffusion_strength, 0.2, 0.8, out=self.diffusion_strength)
+        self.pulse_strength += self._delta
+        np.clip(self.pulse_strength, 0.2, 1.0, out=self.pulse_strength)
+        return self.diffusion_strength, self.pulse_strength
+
+    def step(self, energies):
+        return self.regulate(self.coherence(energies))
+
+    def diffusion_field(self, out=None):
+        """Per-voxel diffusion strength, for FieldEngine.step()."""
+        return np.take(self.diffusion_strength, self.labels, out=out)
+
+    def pulse_field(self, out=None):
+        """Per-voxel pulse strength, for FieldEngine.step() (sampled at each pulse)."""
+        return np.take(self.pulse_strength, self.labels, out=out)
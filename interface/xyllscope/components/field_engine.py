@@ -0,0 +1,234 @@
+# v3.6 Field engine — 3D diffusion / pulse / flow behind the voxel viewer
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# explicit 7-point stencil is stable for coefficients up to 1/6
+MAX_STABLE_COEF = 1.0 / 6.0
+
+
+class FieldEngine:
+    """Double-buffered 3D diffusion field with pulse injection and flow vectors.
+
+    The grid lives inside a one-voxel halo (zero-flux boundary). Each tick
+    splits the interior into slabs along x and runs the stencil for every
+    slab on a thread pool; NumPy releases the GIL inside the ufuncs, so slabs
+    run concurrently. All work buffers are allocated once in __init__.
+    """
+
+    def __init__(self, shape=(128, 128, 128), workers=None, slab=None, decay=0.0,
+                 pulse_speed=0.6, pulse_life=24):
+        self.shape = tuple(shape)
+        nx, ny, nz = self.shape
+        padded = (nx + 2, ny + 2, nz + 2)
+        self._cur = np.zeros(padded)
+        self._nxt = np.zeros(padded)
+        self.decay = float(decay)
+        self.pulse_speed = pulse_speed
+        self.pulse_life = pulse_life
+        self.tick = 0
+
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        slab = slab or max(1, -(-nx // self.workers))
+        self._slabs = [(i, min(i + slab, nx)) for i in range(0, nx, slab)]
+        self._scratch = [np.empty((i1 - i0, ny, nz)) for i0, i1 in self._slabs]
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if len(self._slabs) > 1 else None
+
+        # flow / diffusion-map output buffers
+        self._grad = np.empty((3,) + self.shape)
+        self._dmap = np.empty(self.shape)
+        self._coef = None           # halo-padded per-voxel coefficients, allocated on first use
+        self._scratch2 = None       # second per-slab buffer for the flux-form stencil
+
+        self._pending = []          # (x, y, z, intensity, radius) queued for next tick
+        self._kernels = {}          # radius -> gaussian kernel
+        self._flow_idx = {}         # stride -> flattened sample coordinates
+        self._last_pulse = None     # (x, y, z, tick)
+
+    # --- views ---
+    @property
+    def field(self):
+        """Interior view of the current buffer (no copy)."""
+        return self._cur[1:-1, 1:-1, 1:-1]
+
+    def load(self, energies):
+        np.copyto(self.field, energies)
+        self._refresh_halo(self._cur)
+
+    # --- pulses ---
+    def inject_pulse(self, x, y, z, intensity=1.0, radius=2):
+        """Queue a gaussian pulse; applied at the start of the next tick."""
+        self._pending.append((int(x), int(y), int(z), float(intensity), int(radius)))
+
+    def _kernel(self, r):
+        k = self._kernels.get(r)
+        if k is None:
+            ax = np.arange(-r, r + 1)
+            d2 = ax[:, None, None] ** 2 + ax[None, :, None] ** 2 + ax[None, None, :] ** 2
+            k = np.exp(-d2 / float(max(r, 1) ** 2))
+            self._kernels[r] = k
+        return k
+
+    def _apply_pulses(self, pulse_strength):
+        f = self.field
+        for x, y, z, amp, r in self._pending:
+            if np.isscalar(pulse_strength):
+                strength = pulse_strength
+            else:
+                # per-region strengths: sampled at the pulse centre
+                strength = float(pulse_strength[tuple(min(max(c, 0), n - 1)
+                                                      for c, n in zip((x, y, z), self.shape))])
+            k = self._kernel(r)
+            lo = [max(0, c - r) for c in (x, y, z)]
+            hi = [min(n, c + r + 1) for c, n in zip((x, y, z), self.shape)]
+            if any(b <= a for a, b in zip(lo, hi)):
+                continue
+            kv = k[lo[0] - x + r:hi[0] - x + r, lo[1] - y + r:hi[1] - y + r, lo[2] - z + r:hi[2] - z + r]
+            region = f[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]]
+            region += (amp * strength) * kv
+            self._last_pulse = (x, y, z, self.tick)
+        self._pending.clear()
+
+    # --- stencil ---
+    @staticmethod
+    def _refresh_halo(a):
+        a[0] = a[1]
+        a[-1] = a[-2]
+        a[:, 0] = a[:, 1]
+        a[:, -1] = a[:, -2]
+        a[:, :, 0] = a[:, :, 1]
+        a[:, :, -1] = a[:, :, -2]
+
+    def _step_slab(self, idx, coef, keep):
+        i0, i1 = self._slabs[idx]
+        a, dst, scr = self._cur, self._nxt[1 + i0:1 + i1, 1:-1, 1:-1], self._scratch[idx]
+        s = slice(1 + i0, 1 + i1)
+        c = a[s, 1:-1, 1:-1]
+        np.add(a[i0:i1, 1:-1, 1:-1], a[2 + i0:2 + i1, 1:-1, 1:-1], out=dst)
+        np.add(dst, a[s, :-2, 1:-1], out=dst)
+        np.add(dst, a[s, 2:, 1:-1], out=dst)
+        np.add(dst, a[s, 1:-1, :-2], out=dst)
+        np.add(dst, a[s, 1:-1, 2:], out=dst)
+        np.multiply(c, 6.0, out=scr)
+        np.subtract(dst, scr, out=dst)
+        np.multiply(dst, coef, out=dst)
+        np.add(dst, c, out=dst)
+        if keep != 1.0:
+            np.multiply(dst, keep, out=dst)
+
+    _FACES = ((-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1))
+
+    def _step_slab_flux(self, idx, D, keep):
+        """Variable-coefficient step in flux form, div(D grad u).
+
+        Each face carries (D_i + D_j)/2 * (u_j - u_i), antisymmetric in i and
+        j, so what leaves one voxel enters its neighbour and the total is
+        conserved. Halo faces have u_j == u_i: zero flux.
+        """
+        i0, i1 = self._slabs[idx]
+        a, dst = self._cur, self._nxt[1 + i0:1 + i1, 1:-1, 1:-1]
+        scr, scr2 = self._scratch[idx], self._scratch2[idx]
+        ny, nz = self.shape[1], self.shape[2]
+        s = (slice(1 + i0, 1 + i1), slice(1, 1 + ny), slice(1, 1 + nz))
+        c, dc = a[s], D[s]
+        dst[...] = 0.0
+        for ox, oy, oz in self._FACES:
+            nb = (slice(1 + i0 + ox, 1 + i1 + ox), slice(1 + oy, 1 + ny + oy), slice(1 + oz, 1 + nz + oz))
+            np.subtract(a[nb], c, out=scr)
+            np.add(dc, D[nb], out=scr2)
+            np.multiply(scr, scr2, out=scr)
+            np.add(dst, scr, out=dst)
+        np.multiply(dst, 0.5, out=dst)
+        np.add(dst, c, out=dst)
+        if keep != 1.0:
+            np.multiply(dst, keep, out=dst)
+
+    def step(self, diffusion_strength=0.4, pulse_strength=0.5):
+        """Advance one tick.
+
+        `diffusion_strength` is the EquilibriumEngine knob (0–1): a scalar, or
+        an array of the field's shape for per-region control (stepped in flux
+        form, so energy is conserved across region boundaries).
+        `pulse_strength` scales queued pulses: a scalar, or an array of the
+        field's shape sampled at each pulse's centre.
+        """
+        if self._pending:
+            self._apply_pulses(pulse_strength)
+            self._refresh_halo(self._cur)
+
+        keep = 1.0 - self.decay
+        if np.isscalar(diffusion_strength):
+            coef = float(np.clip(diffusion_strength, 0.0, 1.0)) * MAX_STABLE_COEF
+            kernel = self._step_slab
+        else:
+            # per-voxel strengths (e.g. RegionalEquilibriumEngine.diffusion_field())
+            if self._coef is None:
+                self._coef = np.empty(self._cur.shape)
+                self._scratch2 = [np.empty_like(b) for b in self._scratch]
+            inner = self._coef[1:-1, 1:-1, 1:-1]
+            np.clip(diffusion_strength, 0.0, 1.0, out=inner)
+            inner *= MAX_STABLE_COEF
+            self._refresh_halo(self._coef)
+            coef = self._coef
+            kernel = self._step_slab_flux
+        if self._pool is None:
+            kernel(0, coef, keep)
+        else:
+            list(self._pool.map(lambda i: kernel(i, coef, keep), range(len(self._slabs))))
+
+        self._cur, self._nxt = self._nxt, self._cur
+        self._refresh_halo(self._cur)
+        self.tick += 1
+        return self.field
+
+    def advance(self, budget_s, diffusion_strength=0.4, pulse_strength=0.5):
+        """Run as many ticks as fit in `budget_s` seconds; returns ticks run."""
+        deadline = time.perf_counter() + budget_s
+        n = 0
+        while time.perf_counter() < deadline:
+            self.step(diffusion_strength, pulse_strength)
+            n += 1
+        return n
+
+    # --- viewer inputs ---
+    def diffusion_map(self):
+        """Field normalised to [0, 1] in a reused buffer (for the glow volume)."""
+        f = self.field
+        lo, hi = f.min(), f.max()
+        np.subtract(f, lo, out=self._dmap)
+        np.multiply(self._dmap, 1.0 / (hi - lo + 1e-9), out=self._dmap)
+        return self._dmap
+
+    def flow_vectors(self, stride=8):
+        """Down-gradient flow sampled every `stride` voxels: (ix, iy, iz, gx, gy, gz)."""
+        a, g = self._cur, self._grad
+        # central differences from the halo-padded buffer
+        np.subtract(a[2:, 1:-1, 1:-1], a[:-2, 1:-1, 1:-1], out=g[0])
+        np.subtract(a[1:-1, 2:, 1:-1], a[1:-1, :-2, 1:-1], out=g[1])
+        np.subtract(a[1:-1, 1:-1, 2:], a[1:-1, 1:-1, :-2], out=g[2])
+        np.multiply(g, -0.5, out=g)
+
+        sub = g[:, ::stride, ::stride, ::stride]
+        idx = self._flow_idx.get(stride)
+        if idx is None:
+            grids = np.meshgrid(*(np.arange(0, n, stride) for n in self.shape), indexing="ij")
+            idx = self._flow_idx[stride] = tuple(m.ravel() for m in grids)
+        ix, iy, iz = idx
+        return (ix, iy, iz,
+                sub[0].ravel(), sub[1].ravel(), sub[2].ravel())
+
+    def pulse_frame(self):
+        """(x, y, z, radius) of the expanding wavefront of the latest pulse, or None."""
+        if self._last_pulse is None:
+            return None
+        x, y, z, t0 = self._last_pulse
+        age = self.tick - t0
+        if age > self.pulse_life:
+            return None
+        return (x, y, z, 1.0 + self.pulse_speed * age)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
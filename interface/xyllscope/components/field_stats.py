@@ -0,0 +1,144 @@
+# v3.6 Incremental field statistics — coherence in O(changed voxels)
+import numpy as np
+
+
+def _as_slices(region, shape):
+    """Normalise a region (tuple of slices/ints) to concrete (start, stop) bounds."""
+    if not isinstance(region, tuple):
+        region = (region,)
+    region = region + (slice(None),) * (len(shape) - len(region))
+    bounds = []
+    for r, n in zip(region, shape):
+        if isinstance(r, slice):
+            start, stop, step = r.indices(n)
+            if step != 1:
+                raise ValueError("strided regions are not supported")
+        else:
+            start = int(r) % n
+            stop = start + 1
+        bounds.append((start, stop))
+    return bounds
+
+
+class FieldStats:
+    """Running sum / sum-of-squares over a field, updated from changed regions.
+
+    Mutate the field through `apply()` (set values), `add()` (add a delta)
+    or `scale()` (multiply everything, O(1)) and the statistics follow in
+    O(region) time. With `track_gradient=True`
+    the gradient magnitude is also maintained, with per-block maxima so the
+    global max is O(blocks) to read. `resync()` recomputes everything to
+    shed accumulated rounding error; it runs every `resync_every` updates.
+    """
+
+    def __init__(self, field, track_gradient=False, block=8, resync_every=10_000):
+        self.field = field
+        self.track_gradient = track_gradient
+        self.block = block
+        self.resync_every = resync_every
+        self._updates = 0
+        self.gmag = None
+        self._bmax = None
+        self.resync()
+
+    # --- full recompute ---
+    def resync(self):
+        f = self.field
+        self.n = f.size
+        self.s1 = float(np.sum(f))
+        self.s2 = float(np.sum(f * f))
+        if self.track_gradient:
+            self.gmag = self._grad_mag(f)
+            nb = tuple(-(-n // self.block) for n in f.shape)
+            self._bmax = np.zeros(nb)
+            self._refresh_blocks([(0, n) for n in f.shape])
+        self._updates = 0
+
+    # --- incremental updates ---
+    def _view(self, region):
+        """Slice view of field[region]; integer indices become length-1 slices,
+        so writes through it always land in the field (never a scalar copy)."""
+        bounds = _as_slices(region, self.field.shape)
+        return bounds, self.field[tuple(slice(a, b) for a, b in bounds)]
+
+    def apply(self, region, values):
+        """Set field[region] = values and update the statistics."""
+        bounds, view = self._view(region)
+        self.s1 -= float(np.sum(view))
+        self.s2 -= float(np.sum(view * view))
+        view[...] = np.reshape(values, view.shape) if np.ndim(values) else values
+        self._after(bounds, view)
+
+    def add(self, region, delta):
+        """field[region] += delta and update the statistics."""
+        bounds, view = self._view(region)
+        self.s1 -= float(np.sum(view))
+        self.s2 -= float(np.sum(view * view))
+        view += np.reshape(delta, view.shape) if np.ndim(delta) else delta
+        self._after(bounds, view)
+
+    def scale(self, k):
+        """field *= k; the sums (and gradient maxima) scale without a pass."""
+        self.field *= k
+        self.s1 *= k
+        self.s2 *= k * k
+        if self.track_gradient:
+            self.gmag *= abs(k)
+            self._bmax *= abs(k)
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.resync()
+
+    def _after(self, bounds, view):
+        self.s1 += float(np.sum(view))
+        self.s2 += float(np.sum(view * view))
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.resync()
+            return
+        if self.track_gradient:
+            self._update_gradient(bounds)
+
+    # --- readouts (O(1)) ---
+    @property
+    def mean(self):
+        return self.s1 / self.n
+
+    @property
+    def std(self):
+        m = self.mean
+        return float(np.sqrt(max(self.s2 / self.n - m * m, 0.0)))
+
+    def coherence(self):
+        """1 - std/mean, clipped to [0, 1] (the Xyllscope coherence readout)."""
+        return float(max(0, min(1, 1 - self.std / (self.mean + 1e-9))))
+
+    def grad_max(self):
+        if not self.track_gradient:
+            raise RuntimeError("FieldStats created without track_gradient")
+        return float(self._bmax.max())
+
+    # --- gradient bookkeeping ---
+    @staticmethod
+    def _grad_mag(a):
+        grad = np.gradient(a) if min(a.shape) > 1 else [np.zeros_like(a)]
+        return np.sqrt(sum(g ** 2 for g in grad))
+
+    def _update_gradient(self, bounds):
+        shape = self.field.shape
+        # gradient changes one voxel beyond the edit; central differences need one more
+        touched = [(max(0, a - 1), min(n, b + 1)) for (a, b), n in zip(bounds, shape)]
+        window = [(max(0, a - 1), min(n, b + 1)) for (a, b), n in zip(touched, shape)]
+        win = tuple(slice(a, b) for a, b in window)
+        g = self._grad_mag(self.field[win])
+        inner = tuple(slice(ta - wa, tb - wa) for (ta, tb), (wa, _) in zip(touched, window))
+        self.gmag[tuple(slice(a, b) for a, b in touched)] = g[inner]
+        self._refresh_blocks(touched)
+
+    def _refresh_blocks(self, bounds):
+        b = self.block
+        ranges = [range(a // b, -(-bx // b)) for a, bx in bounds]
+        for idx in np.ndindex(*(len(r) for r in ranges)):
+            blk = tuple(r[i] for r, i in zip(ranges, idx))
+            sl = tuple(slice(k * b, (k + 1) * b) for k in blk)
+            self._bmax[blk] = self.gmag[sl].max()
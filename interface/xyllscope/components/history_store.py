@@ -0,0 +1,137 @@
+# v3.6 Multi-resolution coherence history
+import numpy as np
+
+
+def minmax_decimate(t, v, max_points):
+    """Shape-preserving decimation: keep the min and max of each bucket, in time order."""
+    t, v = np.asarray(t, dtype=float), np.asarray(v, dtype=float)
+    n = len(v)
+    if n <= max_points or max_points < 2:
+        return t, v
+    buckets = max_points // 2
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    starts = edges[:-1]
+    imin = np.array([s + np.argmin(v[s:e]) for s, e in zip(starts, edges[1:])])
+    imax = np.array([s + np.argmax(v[s:e]) for s, e in zip(starts, edges[1:])])
+    idx = np.unique(np.concatenate([imin, imax]))
+    return t[idx], v[idx]
+
+
+class _Level:
+    """Ring buffer of min/max buckets, each summarising `span` raw samples."""
+
+    def __init__(self, span, capacity):
+        self.span = span
+        self.capacity = capacity
+        self.t0 = np.empty(capacity)
+        self.tmin = np.empty(capacity)
+        self.vmin = np.empty(capacity)
+        self.tmax = np.empty(capacity)
+        self.vmax = np.empty(capacity)
+        self.size = 0
+        self.head = 0
+        self._reset()
+
+    def _reset(self):
+        self.n = 0
+        self.acc = [0.0, 0.0, np.inf, 0.0, -np.inf]   # t0, tmin, vmin, tmax, vmax
+
+    def add(self, t, v):
+        a = self.acc
+        if self.n == 0:
+            a[0] = t
+        if v < a[2]:
+            a[1], a[2] = t, v
+        if v > a[4]:
+            a[3], a[4] = t, v
+        self.n += 1
+        if self.n == self.span:
+            i = self.head
+            self.t0[i], self.tmin[i], self.vmin[i], self.tmax[i], self.vmax[i] = a
+            self.head = (i + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            self._reset()
+
+    def oldest(self):
+        if self.size == 0:
+            return self.acc[0] if self.n else np.inf
+        return self.t0[(self.head - self.size) % self.capacity]
+
+    def buckets(self):
+        """Completed buckets in time order, plus the partial one if any."""
+        order = (np.arange(self.size) + self.head - self.size) % self.capacity
+        cols = [self.t0[order], self.tmin[order], self.vmin[order], self.tmax[order], self.vmax[order]]
+        if self.n:
+            cols = [np.append(c, x) for c, x in zip(cols, self.acc)]
+        return cols
+
+
+class HistoryStore:
+    """Coherence history kept at several resolutions, updated on every append.
+
+    Level k summarises `fanout**k` raw samples per bucket and keeps the last
+    `capacity` buckets, so with the defaults level 0 holds ~1 h of 900 ms
+    ticks and the coarsest level days. `query()` picks the finest level that
+    covers the window within the point budget and returns its min/max points.
+    """
+
+    def __init__(self, capacity=4096, fanout=8, levels=5):
+        self.levels = [_Level(fanout ** k, capacity) for k in range(levels)]
+        self.count = 0
+        self.last_t = None
+
+    def append(self, t, v):
+        t, v = float(t), float(v)
+        for lvl in self.levels:
+            lvl.add(t, v)
+        self.count += 1
+        self.last_t = t
+
+    def span(self):
+        if self.count == 0:
+            return None
+        return min(lvl.oldest() for lvl in self.levels), self.last_t
+
+    def query(self, start=None, end=None, max_points=600):
+        """Decimated (t, v) for [start, end] with at most ~max_points points."""
+        if self.count == 0:
+            return np.empty(0), np.empty(0)
+        lo, hi = self.span()
+        # windows padded past the data (autorange, edge box-zoom) must not
+        # push the level choice to the coarsest one
+        start = lo if start is None else max(start, lo)
+        end = hi if end is None else min(end, hi)
+        if start > end:
+            return np.empty(0), np.empty(0)
+
+        chosen = None
+        for lvl in self.levels:
+            t0, tmin, vmin, tmax, vmax = lvl.buckets()
+            # a bucket spans [its first sample, the next bucket's first sample)
+            t1 = np.append(t0[1:], hi)
+            sel = (t0 <= end) & (t1 >= start)
+            covers = lvl.oldest() <= start or lvl is self.levels[-1]
+            chosen = (tmin[sel], vmin[sel], tmax[sel], vmax[sel])
+            per_bucket = 1 if lvl.span == 1 else 2
+            if covers and per_bucket * int(sel.sum()) <= max_points:
+                break
+
+        tmin, vmin, tmax, vmax = chosen
+        # emit each bucket's extremes in time order; single-sample buckets once
+        first_is_min = tmin <= tmax
+        ta = np.where(first_is_min, tmin, tmax)
+        va = np.where(first_is_min, vmin, vmax)
+        tb = np.where(first_is_min, tmax, tmin)
+        vb = np.where(first_is_min, vmax, vmin)
+        t = np.column_stack([ta, tb]).ravel()
+        v = np.column_stack([va, vb]).ravel()
+        keep = np.ones(len(t), dtype=bool)
+        keep[1::2] = ta != tb
+        t, v = t[keep], v[keep]
+        # a bucket straddling the window edge can carry extremes outside it
+        inside = (t >= start) & (t <= end)
+        if not inside.any():
+            # window narrower than the covering bucket(s) (old data, where only
+            # coarse levels reach): show their range pinned to the window
+            return minmax_decimate(np.clip(t, start, end), v, max_points)
+        return minmax_decimate(t[inside], v[inside], max_points)
@@ -0,0 +1,73 @@
+# v3.6 Precomputed projection planes over a 3D field
+from components.field_stats import _as_slices
+
+
+class FieldProjections:
+    """Mean / max / argmax planes along each axis of a 3D field.
+
+    Planes are computed once and then refreshed only over the footprint of
+    each changed region: for axis `a`, just the lines through the region
+    are re-reduced. Readers get stored planes instead of reducing the
+    whole volume on every render.
+
+    FieldEngine swaps its buffers every tick, so `engine.field` is a new
+    view each step: pass it to `refresh(field)` / `update(region, field)`
+    to rebind before reducing.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self._sum = [None] * 3
+        self._max = [None] * 3
+        self._argmax = [None] * 3
+        self.version = 0
+        self.refresh()
+
+    def refresh(self, field=None):
+        if field is not None:
+            self.field = field
+        f = self.field
+        for a in range(3):
+            self._sum[a] = f.sum(axis=a)
+            self._max[a] = f.max(axis=a)
+            self._argmax[a] = f.argmax(axis=a)
+        self.version += 1
+
+    def update(self, region, field=None):
+        """Re-reduce the lines through `region` after field[region] changed.
+
+        Only valid when the rest of `field` matches what was last reduced
+        (e.g. a pulse between ticks); after a diffusion step use refresh().
+        """
+        if field is not None:
+            self.field = field
+        bounds = _as_slices(region, self.field.shape)
+        for a in range(3):
+            sel = [slice(lo, hi) for lo, hi in bounds]
+            sel[a] = slice(None)
+            block = self.field[tuple(sel)]
+            plane = tuple(s for i, s in enumerate(sel) if i != a)
+            self._sum[a][plane] = block.sum(axis=a)
+            self._max[a][plane] = block.max(axis=a)
+            self._argmax[a][plane] = block.argmax(axis=a)
+        self.version += 1
+
+    # --- projection API ---
+    def mean(self, axis=2):
+        return self._sum[axis] / self.field.shape[axis]
+
+    def max(self, axis=2):
+        return self._max[axis]
+
+    def argmax(self, axis=2):
+        return self._argmax[axis]
+
+    def slice(self, axis, index):
+        """Arbitrary plane through the field (a view, no copy)."""
+        sel = [slice(None)] * 3
+        sel[axis] = index
+        return self.field[tuple(sel)]
+
+    def pick(self, x, y):
+        """Depth of the brightest voxel under (x, y), as the voxel viewer selects it."""
+        return int(self._argmax[2][x, y])
@@ -0,0 +1,36 @@
+# v3.6 Shared render cache — one build per field version, served to every session
+import threading
+from collections import OrderedDict
+
+
+class RenderCache:
+    """Caches rendered payloads keyed by (field version, kind).
+
+    The first session to ask for a payload builds it (under a lock, so
+    concurrent sessions wait rather than duplicate the work); every other
+    session gets the same object. Only the newest `keep` versions are kept.
+    """
+
+    def __init__(self, keep=3):
+        self.keep = keep
+        self._versions = OrderedDict()   # version -> {kind: payload}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, kind, build):
+        with self._lock:
+            entry = self._versions.get(version)
+            if entry is None:
+                entry = self._versions[version] = {}
+                while len(self._versions) > self.keep:
+                    self._versions.popitem(last=False)
+            if kind in entry:
+                self.hits += 1
+                return entry[kind]
+            self.misses += 1
+            payload = entry[kind] = build()
+            return payload
+
+    def stats(self):
+        return {"versions": len(self._versions), "hits": self.hits, "misses": self.misses}
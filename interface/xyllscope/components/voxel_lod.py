@@ -0,0 +1,59 @@
+# v3.6 Voxel level-of-detail helpers
+import numpy as np
+
+DEFAULT_BUDGET = 32 ** 3
+
+
+def lod_factor(shape, budget=DEFAULT_BUDGET):
+    """Smallest integer block size whose downsampled grid fits `budget` voxels."""
+    f = 1
+    while np.prod([-(-n // f) for n in shape]) > budget:
+        f += 1
+    return f
+
+
+def block_reduce(arr, f):
+    """Block-average a 3D array by factor `f` (edge blocks average what they hold)."""
+    if f == 1:
+        return arr
+    nx, ny, nz = arr.shape
+    bx, by, bz = -(-nx // f), -(-ny // f), -(-nz // f)
+    pad = ((0, bx * f - nx), (0, by * f - ny), (0, bz * f - nz))
+    if any(p[1] for p in pad):
+        sums = np.pad(arr, pad).reshape(bx, f, by, f, bz, f).sum(axis=(1, 3, 5))
+        counts = np.pad(np.ones(arr.shape), pad).reshape(bx, f, by, f, bz, f).sum(axis=(1, 3, 5))
+        return sums / counts
+    return arr.reshape(bx, f, by, f, bz, f).mean(axis=(1, 3, 5))
+
+
+def lod_volume(energies, budget=DEFAULT_BUDGET, region=None):
+    """Downsample `energies` (or a sub-`region` of it) to fit `budget`.
+
+    `region` is ((x0, x1), (y0, y1), (z0, z1)) in full-resolution voxels,
+    e.g. what a camera zoom asks to see in more detail. Returns flattened
+    (x, y, z, values, factor) with coordinates at block centres in
+    full-resolution units, ready for go.Volume.
+    """
+    energies = np.asarray(energies)
+    if region is not None:
+        (x0, x1), (y0, y1), (z0, z1) = region
+        energies = energies[x0:x1, y0:y1, z0:z1]
+        origin = (x0, y0, z0)
+    else:
+        origin = (0, 0, 0)
+
+    f = lod_factor(energies.shape, budget)
+    small = block_reduce(energies, f)
+    axes = [o + np.minimum(np.arange(m) * f + (f - 1) / 2.0, n - 1)
+            for o, m, n in zip(origin, small.shape, energies.shape)]
+    x, y, z = np.meshgrid(*axes, indexing="ij")
+    return x.ravel(), y.ravel(), z.ravel(), small.ravel(), f
+
+
+def merge_edges(edges):
+    """Flatten [(p0, p1), ...] into one polyline with NaN breaks between edges."""
+    seg = np.asarray(edges, dtype=float).reshape(-1, 2, 3)
+    out = np.full((seg.shape[0], 3, 3), np.nan)
+    out[:, :2] = seg
+    out = out.reshape(-1, 3)
+    return out[:, 0], out[:, 1], out[:, 2]
@@ -1,6 +1,8 @@
 import plotly.graph_objects as go
 import numpy as np
 
+from components.voxel_lod import DEFAULT_BUDGET, lod_volume, merge_edges
+
 def generate_voxel_fig(
     energies,
     selected_voxel=None,
@@ -12,11 +14,16 @@ def generate_voxel_fig(
     show_diffusion=True,
     show_flow=True,
     show_xntf=True,
+    voxel_budget=DEFAULT_BUDGET,
+    detail_region=None,
+    projections=None,
 ):
-    energies = np.array(energies)
-    nx, ny, nz = energies.shape
-    x, y, z = np.xntfgrid(np.arange(nx), np.arange(ny), np.arange(nz))
-    values = energies.flatten()
+    """`voxel_budget` caps voxels sent per volume trace (block-averaged LOD);
+    `detail_region` ((x0, x1), (y0, y1), (z0, z1)) renders only that box,
+    at up to the same budget, when a camera zooms in. `projections`
+    (FieldProjections) answers voxel picks from the stored argmax plane."""
+    energies = np.asarray(energies)
+    x, y, z, values, _ = lod_volume(energies, voxel_budget, detail_region)
 
     # --- Color logic ---
     if harmonic_mode:
@@ -33,9 +40,9 @@ def generate_voxel_fig(
 
     fig = go.Figure(
         data=go.Volume(
-            x=x.flatten(),
-            y=y.flatten(),
-            z=z.flatten(),
+            x=x,
+            y=y,
+            z=z,
             value=values,
             opacity=0.25,
             surface_count=12,
@@ -50,10 +57,11 @@ def generate_voxel_fig(
 
     # --- Diffusion Glow ---
     if show_diffusion and diffusion_map is not None:
-        glow = np.clip(diffusion_map * 1.5, 0, 1)
+        _, _, _, glow, _ = lod_volume(diffusion_map, voxel_budget, detail_region)
+        glow = np.clip(glow * 1.5, 0, 1)
         fig.add_trace(go.Volume(
-            x=x.flatten(), y=y.flatten(), z=z.flatten(),
-            value=glow.flatten(), opacity=0.06,
+            x=x, y=y, z=z,
+            value=glow, opacity=0.06,
             surface_count=8, colorscale="Electric",
             showscale=False
         ))
@@ -63,7 +71,7 @@ def generate_voxel_fig(
         px, py, pz, radius = pulse_frame
         phi = np.linspace(0, np.pi, 40)
         theta = np.linspace(0, 2 * np.pi, 40)
-        phi, theta = np.xntfgrid(phi, theta)
+        phi, theta = np.meshgrid(phi, theta)
         xs = px + radius * np.sin(phi) * np.cos(theta)
         ys = py + radius * np.sin(phi) * np.sin(theta)
         zs = pz + radius * np.cos(phi)
@@ -82,22 +90,20 @@ def generate_voxel_fig(
             colorscale="Blues", opacity=0.4, showscale=False
         ))
 
-    # --- Mesh Links ---
-    if show_xntf and xntf_edges is not None:
-        for e in xntf_edges:
-            fig.add_trace(go.Scatter3d(
-                x=[e[0][0], e[1][0]],
-                y=[e[0][1], e[1][1]],
-                z=[e[0][2], e[1][2]],
-                mode="lines",
-                line=dict(color="cyan", width=2),
-                opacity=0.25,
-            ))
+    # --- Mesh Links (one trace, NaN-separated segments) ---
+    if show_xntf and xntf_edges is not None and len(xntf_edges):
+        ex, ey, ez = merge_edges(xntf_edges)
+        fig.add_trace(go.Scatter3d(
+            x=ex, y=ey, z=ez,
+            mode="lines", connectgaps=False,
+            line=dict(color="cyan", width=2),
+            opacity=0.25,
+        ))
 
     # --- Highlight Selected ---
     if selected_voxel is not None:
         vx, vy = selected_voxel
-        vz = np.argmax(energies[vx, vy])
+        vz = projections.pick(vx, vy) if projections is not None else np.argmax(energies[vx, vy])
         fig.add_trace(go.Scatter3d(
             x=[vx], y=[vy], z=[vz],
             mode="markers", marker=dict(size=8, color="cyan")
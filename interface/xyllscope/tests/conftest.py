@@ -0,0 +1,5 @@
+# components are imported as `components.x`, as app.py does
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
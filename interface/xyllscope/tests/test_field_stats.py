@@ -0,0 +1,29 @@
+import numpy as np
+
+from components.field_stats import FieldStats
+
+
+def _coherence(f):
+    return float(max(0, min(1, 1 - f.std() / (f.mean() + 1e-9))))
+
+
+def test_updates_track_full_recompute():
+    rng = np.random.default_rng(0)
+    f = rng.random((16, 16))
+    stats = FieldStats(f)
+    for _ in range(200):
+        x, y = rng.integers(16, size=2)
+        stats.scale(0.95)
+        stats.apply((x, y), rng.random())
+        stats.add((slice(x, x + 2), y), 0.1)
+    assert abs(stats.coherence() - _coherence(f)) < 1e-9
+    assert abs(stats.mean - f.mean()) < 1e-12
+
+
+def test_integer_region_writes_through():
+    f = np.zeros((4, 4, 4))
+    stats = FieldStats(f, track_gradient=True, block=2)
+    stats.apply((1, 2, 3), 5.0)
+    assert f[1, 2, 3] == 5.0
+    assert stats.s1 == 5.0
+    assert stats.grad_max() > 0
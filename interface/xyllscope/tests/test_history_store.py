@@ -0,0 +1,54 @@
+import numpy as np
+
+from components.history_store import HistoryStore, minmax_decimate
+
+
+def _filled(n, period=37):
+    h = HistoryStore()
+    for i in range(n):
+        h.append(i, (i % period) / period)
+    return h
+
+
+def test_empty_store():
+    t, v = HistoryStore().query()
+    assert len(t) == 0 and len(v) == 0
+
+
+def test_recent_window_is_raw():
+    h = _filled(100_000)
+    t, v = h.query(99_990, 99_999)
+    assert t.tolist() == list(range(99_990, 100_000))
+    assert np.allclose(v, (t % 37) / 37)
+
+
+def test_full_range_within_budget():
+    h = _filled(100_000)
+    t, v = h.query(max_points=600)
+    assert 0 < len(t) <= 600
+    assert np.all(np.diff(t) >= 0)
+    assert v.min() == 0.0 and v.max() == 36 / 37
+
+
+def test_narrow_window_over_old_data_is_not_empty():
+    # only coarse levels reach t=1000; their extremes fall outside the window
+    h = _filled(100_000)
+    t, v = h.query(1000, 1010)
+    assert len(t) > 0
+    assert np.all((t >= 1000) & (t <= 1010))
+
+
+def test_window_clamped_to_span():
+    h = _filled(50)
+    t, _ = h.query(-1e9, 1e9)
+    assert t[0] == 0 and t[-1] == 49
+    assert len(h.query(60, 70)[0]) == 0
+
+
+def test_minmax_decimate_keeps_extremes():
+    t = np.arange(10_000, dtype=float)
+    v = np.sin(t / 50)
+    v[1234] = 5.0
+    dt, dv = minmax_decimate(t, v, 200)
+    assert len(dt) <= 200
+    assert dv.max() == 5.0 and dt[dv.argmax()] == 1234
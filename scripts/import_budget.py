@@ -0,0 +1,102 @@
+# ~/work/xyllidium/scripts/import_budget.py
+"""
+Import-time budget for Xyllidium entry points.
+
+Imports each entry point in a fresh interpreter under `-X importtime`,
+takes the median cumulative import time over a few runs and fails if any
+entry point exceeds its budget. Interpreter/site startup is not counted.
+
+  python scripts/import_budget.py
+  python scripts/import_budget.py --runs 9 --only executor run_pipeline
+  python scripts/import_budget.py --tree executor     # show what it pulls in
+"""
+import os, re, sys, json, argparse, statistics, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name: (module, sys.path entry it is imported from, budget in ms)
+ENTRY_POINTS = {
+    "executor": ("core.xyllencore.executor", ROOT, 40),
+    "xap_handler": ("core.xyllenor.xap_handler", ROOT, 40),
+    "cap_handler": ("core.xyllencore.cap_handler", ROOT, 50),
+    "vault_audit": ("core.xyllenor.vault_audit", ROOT, 60),
+    "run_pipeline": ("run_pipeline", os.path.join(ROOT, "core", "xyllira"), 40),
+    "stream_pipeline": ("stream_pipeline", os.path.join(ROOT, "core", "xyllira"), 100),
+    # long-running server: Flask is needed to declare its routes
+    "engine": ("core.xyllenor.engine", ROOT, 250),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+
+def _importtime(module: str, path: str) -> str:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = path
+    env.pop("PYTHONSTARTUP", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=path, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    return proc.stderr
+
+
+def measure(module: str, path: str) -> float:
+    """Cumulative import time of `module` in ms (one fresh interpreter)."""
+    for line in _importtime(module, path).splitlines():
+        m = _LINE.match(line)
+        if m and m.group(4) == module and len(m.group(3)) == 1:  # top level only
+            return int(m.group(2)) / 1000.0
+    raise RuntimeError(f"no importtime entry for {module}")
+
+
+def tree(module: str, path: str, min_ms: float = 2.0):
+    """Print imports under `module` costing at least `min_ms` cumulatively."""
+    rows = [m for m in map(_LINE.match, _importtime(module, path).splitlines()) if m]
+    # children are reported before their parent; the subtree starts after the previous top-level import
+    end = next(i for i, m in enumerate(rows) if m.group(4) == module and len(m.group(3)) == 1)
+    start = max([i for i in range(end) if len(rows[i].group(3)) == 1], default=-1) + 1
+    for m in rows[start:end + 1]:
+        if int(m.group(2)) >= min_ms * 1000:
+            print(f"{int(m.group(2)) / 1000:8.1f} ms {m.group(3)}{m.group(4)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Fail if an entry point's import time exceeds its budget.")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--only", nargs="+", choices=sorted(ENTRY_POINTS))
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    ap.add_argument("--tree", choices=sorted(ENTRY_POINTS), help="print the import tree of one entry point")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    if args.tree:
+        module, path, _ = ENTRY_POINTS[args.tree]
+        tree(module, path)
+        return
+
+    results, over = {}, []
+    for name in args.only or ENTRY_POINTS:
+        module, path, budget = ENTRY_POINTS[name]
+        budget *= args.scale
+        try:
+            ms = statistics.median(measure(module, path) for _ in range(args.runs))
+        except RuntimeError as e:
+            print(f"❌ {name}: {e}")
+            over.append(name)
+            continue
+        ok = ms <= budget
+        results[name] = {"module": module, "median_ms": round(ms, 1), "budget_ms": budget, "ok": ok}
+        if not ok:
+            over.append(name)
+        if not args.json:
+            print(f"{'✅' if ok else '❌'} {name:<16} {ms:7.1f} ms  (budget {budget:.0f} ms)")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
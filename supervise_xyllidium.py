@@ -0,0 +1,224 @@
+# ~/work/xyllidium/supervise_xyllidium.py
+"""
+Xyllidium process supervisor.
+
+Starts Bridge, Engine and Xyllscope in parallel, honouring dependencies;
+each service reports "ready" over a local socket (core/readiness.py) the
+moment its ports are bound, so there are no fixed sleeps or port polling.
+Crashed services are restarted with backoff. Startup times are reported
+per service.
+
+  python supervise_xyllidium.py                 # full stack
+  python supervise_xyllidium.py --only engine   # engine alone
+  python supervise_xyllidium.py --executor      # fire one test intent when the engine is up
+"""
+import os, sys, json, time, socket, signal, argparse, threading, subprocess
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from core.readiness import READY_ENV
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BRIDGE_PORT = 8765
+ENGINE_WS_PORT = 8767     # the bridge owns 8765; the engine gets its own WS port
+ENGINE_HTTP_PORT = 8766
+SCOPE_PORT = 8050
+
+
+@dataclass
+class Service:
+    name: str
+    cmd: List[str]
+    deps: List[str] = field(default_factory=list)
+    cwd: str = ROOT
+    proc: Optional[subprocess.Popen] = None
+    started_at: float = 0.0
+    ready_at: float = 0.0
+    restarts: int = 0
+    ready: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def startup_s(self) -> Optional[float]:
+        return self.ready_at - self.started_at if self.ready_at else None
+
+
+def default_services() -> Dict[str, Service]:
+    py = sys.executable
+    return {
+        "bridge": Service("bridge", [py, "-m", "core.xyllencore.bridge_server"]),
+        "engine": Service("engine", [py, "-m", "core.xyllenor.engine"]),
+        "scope": Service("scope", [py, "app.py"], deps=["bridge"],
+                         cwd=os.path.join(ROOT, "interface", "xyllscope")),
+    }
+
+
+class Supervisor:
+    def __init__(self, services: Dict[str, Service], ready_timeout: float = 30.0,
+                 max_restarts: int = 5, log_dir: str = os.path.join(ROOT, "logs")):
+        self.services = services
+        self.ready_timeout = ready_timeout
+        self.max_restarts = max_restarts
+        self.log_dir = log_dir
+        self.stopping = threading.Event()
+
+        # readiness listener on an ephemeral local port
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self.ready_addr = "127.0.0.1:%d" % self._sock.getsockname()[1]
+
+        os.makedirs(log_dir, exist_ok=True)
+        self.env = os.environ.copy()
+        self.env.update({
+            "PYTHONPATH": ROOT,
+            READY_ENV: self.ready_addr,
+            "XYLL_BRIDGE_PORT": str(BRIDGE_PORT),
+            "XYLL_ENGINE_WS_PORT": str(ENGINE_WS_PORT),
+            "XYLL_ENGINE_HTTP_PORT": str(ENGINE_HTTP_PORT),
+            "XYLL_ENGINE_WS": f"ws://127.0.0.1:{ENGINE_WS_PORT}",
+            "XYLL_ENGINE_HTTP": f"http://127.0.0.1:{ENGINE_HTTP_PORT}",
+            "XYLL_SCOPE_PORT": str(SCOPE_PORT),
+        })
+
+    # ---- readiness ----
+
+    def _listen(self):
+        while not self.stopping.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                if self.stopping.is_set():
+                    return
+                time.sleep(0.05)  # e.g. EMFILE: don't spin
+                continue
+            # a malformed or dropped report must not end readiness tracking
+            with conn:
+                try:
+                    conn.settimeout(2.0)
+                    msg = json.loads(conn.makefile().readline())
+                except (OSError, ValueError):
+                    continue
+            if not isinstance(msg, dict):
+                continue
+            svc = self.services.get(msg.get("service"))
+            if svc is None or not svc.proc or svc.proc.pid != msg.get("pid"):
+                continue
+            svc.ready_at = time.monotonic()
+            svc.ready.set()
+            print(f"✅ {svc.name} ready in {svc.startup_s:.2f}s (pid {svc.proc.pid})")
+
+    # ---- lifecycle ----
+
+    def _spawn(self, svc: Service):
+        svc.ready.clear()
+        svc.ready_at = 0.0
+        svc.started_at = time.monotonic()
+        # the child keeps its own copy of the fd; ours would leak one per restart
+        with open(os.path.join(self.log_dir, f"{svc.name}.log"), "a") as out:
+            svc.proc = subprocess.Popen(svc.cmd, cwd=svc.cwd, env=self.env, stdout=out, stderr=subprocess.STDOUT)
+        with open(os.path.join(self.log_dir, f"{svc.name}.pid"), "w") as f:
+            f.write(str(svc.proc.pid))
+        print(f"🚀 {svc.name} launched (pid {svc.proc.pid})")
+
+    def _start_when_deps_ready(self, svc: Service):
+        for dep in svc.deps:
+            if dep in self.services and not self.services[dep].ready.wait(self.ready_timeout):
+                print(f"❌ {svc.name} not started: dependency {dep} never became ready")
+                return
+        if not self.stopping.is_set():
+            self._spawn(svc)
+
+    def _watch(self, svc: Service):
+        """Restart `svc` with exponential backoff whenever it exits unexpectedly."""
+        backoff = 0.5
+        while not self.stopping.is_set():
+            if svc.proc is None:
+                time.sleep(0.05)
+                continue
+            code = svc.proc.wait()
+            if self.stopping.is_set():
+                return
+            if svc.restarts >= self.max_restarts:
+                print(f"❌ {svc.name} exited ({code}); restart limit reached")
+                return
+            svc.restarts += 1
+            print(f"⚠️ {svc.name} exited ({code}); restarting in {backoff:.1f}s "
+                  f"[{svc.restarts}/{self.max_restarts}]")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 10.0) if not svc.ready_at else 0.5
+            if not self.stopping.is_set():
+                self._spawn(svc)
+
+    def start(self) -> bool:
+        """Launch everything in parallel (deps gate dependents); True if all became ready."""
+        threading.Thread(target=self._listen, daemon=True).start()
+        t0 = time.monotonic()
+        for svc in self.services.values():
+            threading.Thread(target=self._start_when_deps_ready, args=(svc,), daemon=True).start()
+            threading.Thread(target=self._watch, args=(svc,), daemon=True).start()
+
+        deadline = t0 + self.ready_timeout
+        ok = all(s.ready.wait(max(0.0, deadline - time.monotonic())) for s in self.services.values())
+        self.report(time.monotonic() - t0)
+        return ok
+
+    def report(self, total: float):
+        print("\n⏱️  Startup report")
+        for s in self.services.values():
+            t = f"{s.startup_s:.2f}s" if s.startup_s is not None else "not ready"
+            deps = f" (after {', '.join(s.deps)})" if s.deps else ""
+            print(f"   {s.name:<8} {t}{deps}")
+        print(f"   {'total':<8} {total:.2f}s\n")
+
+    def stop(self):
+        self.stopping.set()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+        for s in self.services.values():
+            if s.proc and s.proc.poll() is None:
+                s.proc.terminate()
+        for s in self.services.values():
+            if s.proc:
+                try:
+                    s.proc.wait(timeout=3)
+                except subprocess.TimeoutExpired:
+                    s.proc.kill()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Supervise the Xyllidium stack.")
+    ap.add_argument("--only", nargs="+", choices=["bridge", "engine", "scope"])
+    ap.add_argument("--executor", action="store_true", help="run one executor transaction once the engine is ready")
+    ap.add_argument("--ready-timeout", type=float, default=30.0)
+    ap.add_argument("--max-restarts", type=int, default=5)
+    args = ap.parse_args()
+
+    services = default_services()
+    if args.only:
+        services = {n: s for n, s in services.items() if n in args.only}
+        for s in services.values():
+            s.deps = [d for d in s.deps if d in services]
+
+    sup = Supervisor(services, ready_timeout=args.ready_timeout, max_restarts=args.max_restarts)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        if not sup.start():
+            print("⚠️ some services did not report ready; see logs/")
+        if args.executor and "engine" in services and services["engine"].ready.is_set():
+            print("⚙️  Running executor transaction...")
+            subprocess.run([sys.executable, "-m", "core.xyllencore.executor"], env=sup.env, cwd=ROOT, check=False)
+        print("🟢 Xyllidium supervised. Press Ctrl+C to shut down.")
+        while True:
+            time.sleep(3600)
+    except (KeyboardInterrupt, SystemExit):
+        print("\n🧩 Shutting down...")
+    finally:
+        sup.stop()
+
+
+if __name__ == "__main__":
+    main()